@@ -1,119 +1,352 @@
+import os
 import sys
+import json
 import time
 import random
 import csv
+import argparse
+import functools
 import tracemalloc
+import multiprocessing
 from pathlib import Path
-from typing import List, Dict, Callable
+from typing import List, Dict, Callable, Iterator
 
 # Import logic game
 sys.path.append(str(Path(__file__).parent))
 
-from game_logic import WORD_LIST, get_pattern
-from solvers import bfs_solver, dfs_solver, ucs_solver, astar_solver
+from game_logic import ALL_GREEN, get_word_list, STATS, get_pattern, get_pattern_matrix, enable_instrumentation
+from solvers import bfs_solver, dfs_solver, ucs_solver, astar_solver, tree_solver, optimal_solver
+from solvers.heuristics import HEURISTICS
+from benchmark_report import jsonl_path_for, read_results, accumulate, print_totals
 
 #BENCHMARK CONFIGURATION
 SAMPLE_SIZE = 50 
+SEED = 42
 OUTPUT_FILE = "benchmark_results.csv"
+DEFAULT_CHUNKSIZE = 16
+FLUSH_EVERY = 50
+FLUSH_SECONDS = 5.0
 
-def run_single_test(solver_func: Callable, target: str, algo_name: str):
+# List of competitors
+SOLVERS = {
+    "BFS": bfs_solver.solve,
+    "DFS": dfs_solver.solve,
+    "UCS": ucs_solver.solve,
+    "A*": astar_solver.solve,
+    "A* Tree": tree_solver.solve,
+    "Optimal": optimal_solver.solve
+}
 
-    tracemalloc.start()
+def reset_solver_caches() -> None:
+    """Forget decisions carried over from earlier solves (A* best-guess cache, optimal search tables)."""
+    astar_solver.clear_best_guess_cache()
+    optimal_solver.clear_searches()
 
-    start_time = time.time()
-    
+
+def _timed_solve(solver_func: Callable, target: str, algo_name: str, warm_cache: bool = False):
+    """One solve timed with perf_counter/process_time; returns (history, wall, cpu).
+
+    Unless warm_cache is set, solver caches are cleared first so the solve does its full work.
+    """
+    if not warm_cache:
+        reset_solver_caches()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
     try:
         history = solver_func(target)
-        success = False
-        if history and history[-1][1] == (2, 2, 2, 2, 2):
-            success = True
-            
-        guess_count = len(history)
     except Exception as e:
         print(f"  [!] Error running {algo_name} with word {target}: {e}")
-        history = []
+        history = None
+    return history, time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+
+def measure_peak_memory(solver_func: Callable, target: str, warm_cache: bool = False) -> float:
+    """Peak traced memory (KB) of one solve, in its own pass since tracemalloc slows solving."""
+    if not warm_cache:
+        reset_solver_caches()
+    tracemalloc.start()
+    try:
+        solver_func(target)
+    except Exception:
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def instrumentation_columns(stats: Dict, runs: int) -> Dict:
+    """Per-solve counter columns from a STATS snapshot covering `runs` solves."""
+    turn_times = stats["turn_times"]
+    return {
+        "Pattern Calls": stats["pattern_calls"] / runs,
+        "Patterns Scored": stats["patterns_scored"] / runs,
+        "Filter Calls": stats["filter_calls"] / runs,
+        "Candidates Scanned": stats["candidates_scanned"] / runs,
+        "Nodes Pushed": stats["nodes_pushed"] / runs,
+        "Nodes Expanded": stats["nodes_expanded"] / runs,
+        "Nodes Deduplicated": stats["nodes_deduplicated"] / runs,
+        "Avg Turn Time (s)": round(sum(turn_times) / len(turn_times), 6) if turn_times else "",
+        "Max Turn Time (s)": round(max(turn_times), 6) if turn_times else "",
+    }
+
+
+def run_single_test(solver_func: Callable, target: str, algo_name: str,
+                    warmup: int = 0, repeats: int = 1, measure_memory: bool = False,
+                    instrument: bool = False, time_budget: float = None, warm_cache: bool = False):
+
+    if time_budget is not None:
+        solver_func = functools.partial(solver_func, time_budget=time_budget)
+
+    # 1. Warmup runs are not recorded
+    for _ in range(warmup):
+        _timed_solve(solver_func, target, algo_name, warm_cache)
+
+    # 2. Untraced timing pass (counters, if enabled, cover the same solves)
+    if instrument:
+        enable_instrumentation(True)
+    wall_times = []
+    cpu_times = []
+    history = None
+    for _ in range(max(1, repeats)):
+        history, wall, cpu = _timed_solve(solver_func, target, algo_name, warm_cache)
+        wall_times.append(wall)
+        cpu_times.append(cpu)
+    if instrument:
+        stats = STATS.snapshot()
+        enable_instrumentation(False)
+
+    if history is None:
         success = False
         guess_count = 6 # Considered a loss
-        
-    # 3. Stop timing
-    end_time = time.time()
-    time_taken = end_time - start_time
-    
-    # 4. Stop memory measurement and get peak usage
-    current, peak = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
-    
-    # Convert memory to KB
-    memory_peak_kb = peak / 1024
+    else:
+        success = bool(history) and history[-1][1] == ALL_GREEN
+        guess_count = len(history)
+
+    # 3. Optional memory pass
+    memory_peak_kb = ""
+    if measure_memory:
+        memory_peak_kb = round(measure_peak_memory(solver_func, target, warm_cache), 2)
     
-    return {
+    data = {
         "Algorithm": algo_name,
         "Target Word": target,
         "Success": success,
         "Guesses": guess_count,
-        "Time (s)": round(time_taken, 4),
-        "Memory (KB)": round(memory_peak_kb, 2)
+        "Wall Time (s)": round(sum(wall_times) / len(wall_times), 6),
+        "CPU Time (s)": round(sum(cpu_times) / len(cpu_times), 6),
+        "Memory (KB)": memory_peak_kb
     }
+    if time_budget is not None:
+        data["Cut Short Turns"] = getattr(history, "cut_short", 0)
+    if instrument:
+        data.update(instrumentation_columns(stats, len(wall_times)))
+    return data
+
+def prepare_shared_data(algorithms: List[str]):
+    """Load the cached game data once, before worker processes start.
+
+    The pattern matrix is memory-mapped, so forked workers (and spawned ones,
+    which map the same cache file) share its pages instead of each building it.
+    """
+    get_pattern_matrix()
+    if "A* Tree" in algorithms:
+        tree_solver.get_tree()
+
+
+def configure_astar(heuristic: str = "entropy", entropy_estimator: str = "exact", sample_seed: int = 0) -> None:
+    astar_solver.HEURISTIC = heuristic
+    astar_solver.ENTROPY_ESTIMATOR = entropy_estimator
+    astar_solver.SAMPLE_SEED = sample_seed
+
+
+def _init_worker(*astar_config):
+    configure_astar(*astar_config)
+    prepare_shared_data([])
+
+
+def _run_job(job, warmup: int = 0, repeats: int = 1, measure_memory: bool = False, instrument: bool = False,
+             time_budget: float = None, warm_cache: bool = False):
+    algo_name, target = job
+    return run_single_test(SOLVERS[algo_name], target, algo_name, warmup, repeats, measure_memory, instrument,
+                           time_budget, warm_cache)
+
+
+def run_jobs(jobs: List[tuple], workers: int, chunksize: int, astar_config: tuple = (), **measure) -> Iterator[Dict]:
+    """Yield results of (algorithm, target) jobs, in order, as they finish, serially or across a process pool.
+
+    astar_config is passed to configure_astar() in each worker.
+    """
+    run = functools.partial(_run_job, **measure)
+    if workers <= 1:
+        for i, job in enumerate(jobs):
+            if i % 10 == 0:
+                print(f"   Processed {i}/{len(jobs)} jobs...", end="\r")
+            yield run(job)
+        return
+
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=astar_config) as pool:
+        # imap keeps job order, so output matches the serial run
+        for i, data in enumerate(pool.imap(run, jobs, chunksize=chunksize)):
+            if i % 10 == 0:
+                print(f"   Processed {i}/{len(jobs)} jobs...", end="\r")
+            yield data
+
+
+class ResultWriter:
+    """Appends results to a CSV file and a JSONL sibling as they arrive, flushing every
+    FLUSH_EVERY rows or FLUSH_SECONDS, so an interrupted run keeps what it finished."""
+
+    def __init__(self, csv_path: Path, jsonl_path: Path, append: bool = False):
+        mode = "a" if append else "w"
+        self._csv_file = _open_for_append(csv_path) if append else open(csv_path, mode, newline="", encoding="utf-8")
+        self._jsonl_file = _open_for_append(jsonl_path) if append else open(jsonl_path, mode, encoding="utf-8")
+        self._fieldnames = _csv_header(csv_path) if append else None
+        self._writer = None
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def write(self, data: Dict) -> None:
+        if self._writer is None:
+            fieldnames = self._fieldnames or list(data)
+            self._writer = csv.DictWriter(self._csv_file, fieldnames=fieldnames, restval="", extrasaction="ignore")
+            if not self._fieldnames:
+                self._writer.writeheader()
+        self._writer.writerow(data)
+        self._jsonl_file.write(json.dumps(data) + "\n")
+
+        self._pending += 1
+        if self._pending >= FLUSH_EVERY or time.monotonic() - self._last_flush >= FLUSH_SECONDS:
+            self.flush()
+
+    def flush(self) -> None:
+        for f in (self._csv_file, self._jsonl_file):
+            f.flush()
+            os.fsync(f.fileno())
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        self.flush()
+        self._csv_file.close()
+        self._jsonl_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _open_for_append(path: Path):
+    """Open for appending, first ending a line torn by an interrupted run."""
+    if path.exists() and path.stat().st_size > 0:
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            torn = f.read(1) != b"\n"
+        f = open(path, "a", newline="", encoding="utf-8")
+        if torn:
+            f.write("\n")
+        return f
+    return open(path, "a", newline="", encoding="utf-8")
+
+
+def _csv_header(path: Path) -> List[str]:
+    if not path.exists():
+        return []
+    with open(path, newline="", encoding="utf-8") as f:
+        return next(csv.reader(f), [])
+
+
+def select_targets(sample_size: int, seed=None, full: bool = False) -> List[str]:
+    if full:
+        return list(get_word_list())
+    # Optionally filter out very rare words for fairness
+    return random.Random(seed).sample(get_word_list(), sample_size)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Wordle solvers.")
+    parser.add_argument("--sample-size", type=int, default=SAMPLE_SIZE, help="number of random target words")
+    parser.add_argument("--full", action="store_true", help="use every word in the dictionary as a target")
+    parser.add_argument("--seed", type=int, default=SEED, help="seed for the target sample")
+    parser.add_argument("--algorithms", nargs="+", choices=list(SOLVERS), default=list(SOLVERS))
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (1 = serial)")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="jobs handed to a worker at a time")
+    parser.add_argument("--warmup", type=int, default=0, help="untimed solves before each measurement")
+    parser.add_argument("--repeats", type=int, default=1, help="timed solves averaged per target")
+    parser.add_argument("--memory", action="store_true", help="add a separate tracemalloc pass for peak memory")
+    parser.add_argument("--instrument", action="store_true", help="add solver work counters as CSV columns")
+    parser.add_argument("--time-budget", type=float, default=None,
+                        help="seconds each solve may take; slower turns fall back to the best guess so far")
+    parser.add_argument("--warm-cache", action="store_true",
+                        help="keep A* and optimal-solver caches between solves (default: every solve starts cold)")
+    parser.add_argument("--heuristic", choices=list(HEURISTICS), default="entropy",
+                        help="guess scorer for A*, the A* tree and the optimal solver's A* turns")
+    parser.add_argument("--entropy", choices=["exact", "sampled"], default="exact",
+                        help="A* entropy scoring on large candidate sets")
+    parser.add_argument("--sample-seed", type=int, default=0, help="seed for sampled entropy")
+    parser.add_argument("--output", default=OUTPUT_FILE, help="CSV file; a .jsonl copy is written alongside")
+    parser.add_argument("--resume", action="store_true",
+                        help="append to --output, skipping (algorithm, target) pairs it already has")
+    args = parser.parse_args(argv)
+    if Path(args.output).suffix == ".jsonl":
+        parser.error("--output is the CSV file; its .jsonl copy is written alongside")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # 1. Select test set
+    test_set = select_targets(args.sample_size, args.seed, args.full)
 
-def main():
     print(f"--- STARTING BENCHMARK ---")
-    print(f"Number of test words: {SAMPLE_SIZE}")
-    print(f"Algorithms: BFS, DFS, UCS, A*")
+    print(f"Number of test words: {len(test_set)}" + ("" if args.full else f" (seed {args.seed})"))
+    print(f"Algorithms: {', '.join(args.algorithms)}")
+    print(f"Workers: {args.workers}")
+    print(f"A* heuristic: {args.heuristic}")
+    print(f"Solver caches: {'warm' if args.warm_cache else 'cold'}")
     print("-" * 50)
 
-    # 1. Randomly select test set
-    # Optionally filter out very rare words for fairness
-    test_set = random.sample(WORD_LIST, SAMPLE_SIZE)
-    
-    # 2. Define list of competitors
-    solvers = {
-        "BFS": bfs_solver.solve,
-        "DFS": dfs_solver.solve,
-        "UCS": ucs_solver.solve,
-        "A*": astar_solver.solve
-    }
-    
-    results = []
-
-    for algo_name, solve_func in solvers.items():
-        print(f"\n Running algorithm: {algo_name}...")
-        
-        wins = 0
-        total_guesses = 0
-        total_time = 0
-        
-        for i, target in enumerate(test_set):
-            if i % 10 == 0:
-                print(f"   Processed {i}/{SAMPLE_SIZE} words...", end="\r")
-            
-            data = run_single_test(solve_func, target, algo_name)
-            results.append(data)
-            
-            if data["Success"]:
-                wins += 1
-            total_guesses += data["Guesses"]
-            total_time += data["Time (s)"]
-
-        # Print summary for this algorithm
-        avg_guesses = round(total_guesses / SAMPLE_SIZE, 2)
-        avg_time = round(total_time / SAMPLE_SIZE, 4)
-        win_rate = round((wins / SAMPLE_SIZE) * 100, 1)
-        
-        print(f"   ✅ Completed {algo_name} | Win Rate: {win_rate}% | Avg Guesses: {avg_guesses} | Avg Time: {avg_time}s")
-
-    # 4. Save results to CSV file
-    print(f"\n Saving results to {OUTPUT_FILE}...")
-    
+    astar_config = (args.heuristic, args.entropy, args.sample_seed)
+    configure_astar(*astar_config)
+    prepare_shared_data(args.algorithms)
+
+    # 2. Skip pairs an earlier run already finished
+    # Report totals are kept per algorithm as results arrive, so no rows stay in memory
+    jobs = [(algo_name, target) for algo_name in args.algorithms for target in test_set]
+    wanted = set(jobs)
+    totals = {}
+    if args.resume:
+        done = set()
+        for data in read_results(args.output):
+            key = (data.get("Algorithm"), data.get("Target Word"))
+            if key in wanted and key not in done:
+                accumulate([data], totals)
+            done.add(key)
+        jobs = [job for job in jobs if job not in done]
+        print(f"Resuming: {len(done)} done, {len(jobs)} to go")
+
+    # 3. Run the rest, streaming each result to disk
+    print(f"Writing results to {args.output} and {jsonl_path_for(args.output)}")
     try:
-        keys = results[0].keys()
-        with open(OUTPUT_FILE, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=keys)
-            writer.writeheader()
-            writer.writerows(results)
-        print("🎉 DONE!")
-        
+        with ResultWriter(Path(args.output), jsonl_path_for(args.output), append=args.resume) as writer:
+            for data in run_jobs(jobs, args.workers, args.chunksize, astar_config,
+                                 warmup=args.warmup, repeats=args.repeats, measure_memory=args.memory,
+                                 instrument=args.instrument, time_budget=args.time_budget,
+                                 warm_cache=args.warm_cache):
+                writer.write(data)
+                accumulate([data], totals)
+    except KeyboardInterrupt:
+        print("\n⏸ Interrupted. Finished results are saved; rerun with --resume to continue.")
+        return
     except IOError as e:
         print(f"❌ Error writing file: {e}")
+        return
+
+    # 4. Report on this run's (algorithm, target) pairs
+    print_totals(totals)
+    print("\n🎉 DONE!")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
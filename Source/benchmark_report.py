@@ -0,0 +1,252 @@
+import sys
+import csv
+import json
+import math
+import argparse
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+import numpy as np
+
+#REPORT CONFIGURATION
+PERCENTILES = (50, 95, 99)
+MAX_GUESSES = 6
+DEFAULT_ALPHA = 0.01
+# Relative change below which a significant difference is still not a regression
+DEFAULT_MIN_CHANGE = 0.05
+
+
+def jsonl_path_for(output: str) -> Path:
+    return Path(output).with_suffix(".jsonl")
+
+
+def _parse_cell(value: str):
+    if value == "":
+        return None
+    if value in ("True", "False"):
+        return value == "True"
+    for kind in (int, float):
+        try:
+            return kind(value)
+        except ValueError:
+            pass
+    return value
+
+
+def read_results(output: str) -> Iterator[Dict]:
+    """Rows of a benchmark run: from the JSONL file if present, else from the CSV. Torn lines are skipped."""
+    jsonl_path = jsonl_path_for(output)
+    if jsonl_path.exists():
+        with open(jsonl_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+        return
+
+    if not Path(output).exists():
+        return
+    with open(output, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            row = {key: _parse_cell(value) for key, value in row.items() if key is not None}
+            if isinstance(row.get("Guesses"), int) and isinstance(row.get("Wall Time (s)"), (int, float)):
+                yield row
+
+
+def group_by_algorithm(rows) -> Dict[str, List[Dict]]:
+    groups: Dict[str, List[Dict]] = {}
+    for row in rows:
+        groups.setdefault(row["Algorithm"], []).append(row)
+    return groups
+
+
+#STATISTICS
+
+def percentiles(values) -> Dict[int, float]:
+    if not len(values):
+        return {q: float("nan") for q in PERCENTILES}
+    return dict(zip(PERCENTILES, np.percentile(values, PERCENTILES).tolist()))
+
+
+def _empty_histogram() -> Dict[str, int]:
+    histogram = {str(n): 0 for n in range(1, MAX_GUESSES + 1)}
+    histogram[f"{MAX_GUESSES + 1}+"] = 0
+    histogram["fail"] = 0
+    return histogram
+
+
+def _histogram_key(row: Dict) -> str:
+    if not row["Success"]:
+        return "fail"
+    if row["Guesses"] > MAX_GUESSES:
+        return f"{MAX_GUESSES + 1}+"
+    return str(row["Guesses"])
+
+
+def guess_histogram(rows: List[Dict]) -> Dict[str, int]:
+    """Solved games by guess count, plus failures."""
+    histogram = _empty_histogram()
+    for row in rows:
+        histogram[_histogram_key(row)] += 1
+    return histogram
+
+
+class AlgorithmTotals:
+    """Running totals of one algorithm's rows: counts, the guess histogram, and the wall times
+    and memory peaks as float arrays for percentiles. Rows themselves are not kept."""
+
+    def __init__(self):
+        self.runs = 0
+        self.wins = 0
+        self.guess_total = 0
+        self.histogram = _empty_histogram()
+        self.wall = array("d")
+        self.memory = array("d")
+
+    def add(self, row: Dict) -> None:
+        self.runs += 1
+        self.wins += bool(row["Success"])
+        self.guess_total += row["Guesses"]
+        self.histogram[_histogram_key(row)] += 1
+        self.wall.append(row["Wall Time (s)"])
+        if isinstance(row.get("Memory (KB)"), (int, float)):
+            self.memory.append(row["Memory (KB)"])
+
+    def summary(self) -> Dict:
+        summary = {
+            "runs": self.runs,
+            "win_rate": self.wins / self.runs,
+            "mean_guesses": self.guess_total / self.runs,
+            "mean_wall": float(np.mean(self.wall)),
+            "wall_percentiles": percentiles(self.wall),
+            "guess_histogram": dict(self.histogram),
+        }
+        if self.memory:
+            summary["memory_percentiles"] = percentiles(self.memory)
+            summary["max_memory"] = max(self.memory)
+        return summary
+
+
+def accumulate(rows, totals: Dict[str, AlgorithmTotals] = None) -> Dict[str, AlgorithmTotals]:
+    """Add rows to per-algorithm totals (new ones by default), one row at a time."""
+    totals = {} if totals is None else totals
+    for row in rows:
+        totals.setdefault(row["Algorithm"], AlgorithmTotals()).add(row)
+    return totals
+
+
+def summarize(rows: List[Dict]) -> Dict:
+    totals = AlgorithmTotals()
+    for row in rows:
+        totals.add(row)
+    return totals.summary()
+
+
+def welch_test(a: List[float], b: List[float]) -> float:
+    """Two-sided p-value for equal means (Welch's t, normal approximation)."""
+    if len(a) < 2 or len(b) < 2:
+        return 1.0
+    var_a, var_b = np.var(a, ddof=1), np.var(b, ddof=1)
+    se = math.sqrt(var_a / len(a) + var_b / len(b))
+    diff = float(np.mean(b) - np.mean(a))
+    if se == 0:
+        return 0.0 if diff != 0 else 1.0
+    return math.erfc(abs(diff) / se / math.sqrt(2))
+
+
+def proportion_test(wins_a: int, n_a: int, wins_b: int, n_b: int) -> float:
+    """Two-sided p-value for equal win rates (pooled two-proportion z-test)."""
+    pooled = (wins_a + wins_b) / (n_a + n_b)
+    se = math.sqrt(pooled * (1 - pooled) * (1 / n_a + 1 / n_b))
+    diff = wins_b / n_b - wins_a / n_a
+    if se == 0:
+        return 0.0 if diff != 0 else 1.0
+    return math.erfc(abs(diff) / se / math.sqrt(2))
+
+
+#REPORT
+
+def print_report(rows) -> None:
+    print_totals(accumulate(rows))
+
+
+def print_totals(totals: Dict[str, AlgorithmTotals]) -> None:
+    for algo_name, algo_totals in totals.items():
+        s = algo_totals.summary()
+        wall = s["wall_percentiles"]
+        print(f"\n📊 {algo_name} ({s['runs']} runs)")
+        print(f"   Win Rate: {s['win_rate'] * 100:.1f}% | Avg Guesses: {s['mean_guesses']:.3f}")
+        print(f"   Wall Time: mean {s['mean_wall']:.4f}s | p50 {wall[50]:.4f}s | p95 {wall[95]:.4f}s | p99 {wall[99]:.4f}s")
+        print("   Guesses:   " + "  ".join(f"{k}: {v}" for k, v in s["guess_histogram"].items()))
+        if "memory_percentiles" in s:
+            memory = s["memory_percentiles"]
+            print(f"   Memory:    p50 {memory[50]:.1f}KB | p95 {memory[95]:.1f}KB | max {s['max_memory']:.1f}KB")
+
+
+def compare(base_rows, new_rows, alpha: float = DEFAULT_ALPHA, min_change: float = DEFAULT_MIN_CHANGE) -> List[str]:
+    """Print a per-algorithm diff of two runs; returns the regressions found."""
+    base_groups = group_by_algorithm(base_rows)
+    new_groups = group_by_algorithm(new_rows)
+    regressions = []
+
+    print(f"{'Algorithm':<12}{'Metric':<14}{'Base':>12}{'New':>12}{'Change':>10}{'p-value':>10}")
+    for algo_name in base_groups:
+        if algo_name not in new_groups:
+            continue
+        base, new = base_groups[algo_name], new_groups[algo_name]
+        checks = [
+            ("Wall Time", [r["Wall Time (s)"] for r in base], [r["Wall Time (s)"] for r in new]),
+            ("Guesses", [r["Guesses"] for r in base], [r["Guesses"] for r in new]),
+        ]
+        for metric, a, b in checks:
+            mean_a, mean_b = float(np.mean(a)), float(np.mean(b))
+            change = (mean_b - mean_a) / mean_a if mean_a else 0.0
+            p = welch_test(a, b)
+            flag = change > min_change and p < alpha
+            if flag:
+                regressions.append(f"{algo_name} {metric}")
+            print(f"{algo_name:<12}{metric:<14}{mean_a:>12.4f}{mean_b:>12.4f}{change:>+10.1%}{p:>10.4f}"
+                  + ("  ❌" if flag else ""))
+
+        wins_a, wins_b = sum(bool(r["Success"]) for r in base), sum(bool(r["Success"]) for r in new)
+        rate_a, rate_b = wins_a / len(base), wins_b / len(new)
+        p = proportion_test(wins_a, len(base), wins_b, len(new))
+        flag = rate_b < rate_a and p < alpha
+        if flag:
+            regressions.append(f"{algo_name} Win Rate")
+        print(f"{algo_name:<12}{'Win Rate':<14}{rate_a:>12.4f}{rate_b:>12.4f}{rate_b - rate_a:>+10.1%}{p:>10.4f}"
+              + ("  ❌" if flag else ""))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize benchmark results or compare two runs.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    report_parser = commands.add_parser("report", help="percentiles, guess histograms and memory of one run")
+    report_parser.add_argument("results", help="benchmark CSV (or JSONL) file")
+
+    compare_parser = commands.add_parser("compare", help="flag significant regressions from BASE to NEW")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA, help="significance level")
+    compare_parser.add_argument("--min-change", type=float, default=DEFAULT_MIN_CHANGE,
+                                help="ignore slowdowns smaller than this fraction")
+    args = parser.parse_args(argv)
+
+    if args.command == "report":
+        print_report(read_results(args.results))
+        return 0
+
+    regressions = compare(list(read_results(args.base)), list(read_results(args.new)), args.alpha, args.min_change)
+    if regressions:
+        print(f"\n❌ Significant regressions: {', '.join(regressions)}")
+        return 1
+    print("\n✅ No significant regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,15 @@
+import hashlib
+import os
 import random
-from collections import Counter
+import struct
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
 from pathlib import Path
-from typing import List, Tuple
+from typing import Callable, Dict, Hashable, Iterator, List, Sequence, Tuple, Union
+
+import numpy as np
 
 BG = "#121213"
 EMPTY_BG = BG
@@ -18,21 +26,22 @@ COLOR_ABSENT = "#3a3a3c"
 
 #Handle data
 
-def load_word_list() -> List[str]:
+DATA_DIR = Path(__file__).parent / "data"
+DICT_PATH = DATA_DIR / "dictionary.txt"
+CACHE_DIR = DATA_DIR / "cache"
 
-    base_path = Path(__file__).parent
-    dict_path = base_path / "data" / "dictionary.txt"
+# Compiled dictionary: header, then one 5-byte ASCII record per word
+DICT_CACHE_PATH = CACHE_DIR / "dictionary.bin"
+_DICT_HEADER = struct.Struct("<4sqq20sI")  # magic, source mtime_ns, source size, source sha1, word count
+_DICT_MAGIC = b"WRD1"
 
-    if not dict_path.exists():
-        print(f"ERROR: Cannot find out file at {dict_path}")
-        return ["apple", "beach", "crane", "stare", "stone", "world"]
 
-    with dict_path.open("r", encoding="utf-8") as fh:
-        # Read file, strip whitespace, convert to lowercase
-        raw = [line.strip().lower() for line in fh if line.strip()]
+def parse_dictionary(text: str) -> List[str]:
+    # Read file, strip whitespace, convert to lowercase
+    raw = [line.strip().lower() for line in text.splitlines() if line.strip()]
     
-    # Filter only 5-letter words that are alphabetic
-    filtered = [w for w in raw if len(w) == 5 and w.isalpha()]
+    # Filter only 5-letter words that are alphabetic (ASCII, the pattern matrix stores letters as bytes)
+    filtered = [w for w in raw if len(w) == 5 and w.isalpha() and w.isascii()]
     
     # Remove duplicates but keep order
     seen = set()
@@ -44,12 +53,288 @@ def load_word_list() -> List[str]:
             
     return out
 
-# Global variable containing the word list (so other files can import and use it directly)
-WORD_LIST = load_word_list()
+
+def _read_dictionary_cache(stat: os.stat_result):
+    """(words, sha1 hex) from the compiled dictionary, or None if it is missing or stale."""
+    try:
+        data = DICT_CACHE_PATH.read_bytes()
+        magic, mtime_ns, size, digest, count = _DICT_HEADER.unpack_from(data)
+    except (OSError, struct.error):
+        return None
+    if (magic != _DICT_MAGIC or mtime_ns != stat.st_mtime_ns or size != stat.st_size
+            or len(data) != _DICT_HEADER.size + 5 * count):
+        return None
+    records = data[_DICT_HEADER.size:].decode("ascii")
+    return [records[i:i + 5] for i in range(0, 5 * count, 5)], digest.hex()
+
+
+def _write_dictionary_cache(stat: os.stat_result, words: List[str], digest: bytes) -> None:
+    header = _DICT_HEADER.pack(_DICT_MAGIC, stat.st_mtime_ns, stat.st_size, digest, len(words))
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = DICT_CACHE_PATH.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(header + "".join(words).encode("ascii"))
+        os.replace(tmp_path, DICT_CACHE_PATH)
+    except OSError:
+        # Read-only checkout: just parse the text file next time
+        pass
+
+
+def _load_dictionary() -> Tuple[List[str], str]:
+    dict_path = DICT_PATH
+
+    if not dict_path.exists():
+        print(f"ERROR: Cannot find out file at {dict_path}")
+        words = ["apple", "beach", "crane", "stare", "stone", "world"]
+        return words, hashlib.sha1("\n".join(words).encode("utf-8")).hexdigest()
+
+    stat = dict_path.stat()
+    cached = _read_dictionary_cache(stat)
+    if cached is not None:
+        return cached
+
+    raw = dict_path.read_bytes()
+    words = parse_dictionary(raw.decode("utf-8"))
+    digest = hashlib.sha1(raw).digest()
+    _write_dictionary_cache(stat, words, digest)
+    return words, digest.hex()
+
+
+def load_word_list() -> List[str]:
+    return _load_dictionary()[0]
+
+
+class Lexicon:
+    """The ordered word list with hashed membership and per-letter indexes.
+
+    with_letter_at / with_min_count return CandidateSets, so constraint
+    queries are bitset intersections instead of scans over the list.
+    """
+
+    MAX_COUNT = 3
+
+    def __init__(self, words: List[str], digest: str):
+        self.words = words
+        self.index = {w: i for i, w in enumerate(words)}
+        self.hash = digest
+        self._codes = None
+        self._letter_counts = None
+        self._positional = None
+        self._min_count = None
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.words)
+
+    def __getitem__(self, i):
+        return self.words[i]
+
+    @property
+    def codes(self) -> np.ndarray:
+        """(n, 5) encoded letters of every word."""
+        if self._codes is None:
+            self._codes = encode_words(self.words)
+        return self._codes
+
+    @property
+    def letter_counts(self) -> np.ndarray:
+        """(26, n) count of each letter in every word."""
+        if self._letter_counts is None:
+            self._letter_counts = letter_counts(self.codes)
+        return self._letter_counts
+
+    def _build_indexes(self) -> None:
+        letters = self.codes - ord("a")
+        self._positional = [[CandidateSet.from_mask(letters[:, pos] == c) for c in range(26)] for pos in range(5)]
+        self._min_count = [[CandidateSet.from_mask(self.letter_counts[c] >= n) for n in range(1, self.MAX_COUNT + 1)]
+                           for c in range(26)]
+
+    def with_letter_at(self, letter: str, pos: int) -> "CandidateSet":
+        """Words with `letter` at position `pos` (0-based)."""
+        if self._positional is None:
+            self._build_indexes()
+        return self._positional[pos][ord(letter) - ord("a")]
+
+    def with_min_count(self, letter: str, count: int) -> "CandidateSet":
+        """Words containing `letter` at least `count` times."""
+        if count <= 0:
+            return CandidateSet.full()
+        if self._min_count is None:
+            self._build_indexes()
+        c = ord(letter) - ord("a")
+        if count <= self.MAX_COUNT:
+            return self._min_count[c][count - 1]
+        return CandidateSet.from_mask(self.letter_counts[c] >= count)
+
+
+# The word list is loaded on first use, not at import, so importing the
+# solvers (or starting a worker process) stays cheap.
+_LEXICON = None
+
+
+def get_lexicon() -> Lexicon:
+    global _LEXICON
+    if _LEXICON is None:
+        _LEXICON = Lexicon(*_load_dictionary())
+    return _LEXICON
+
+
+def get_word_list() -> List[str]:
+    return get_lexicon().words
+
+
+def get_word_index() -> Dict[str, int]:
+    """Word -> position in the word list."""
+    return get_lexicon().index
+
+
+def dictionary_hash() -> str:
+    """Hash of dictionary.txt, used to key every on-disk cache."""
+    return get_lexicon().hash
+
+
+def __getattr__(name: str):
+    # WORD_LIST / WORD_INDEX stay importable (so other files can use them directly) but load lazily
+    if name == "WORD_LIST":
+        return get_word_list()
+    if name == "WORD_INDEX":
+        return get_word_index()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+#INSTRUMENTATION
+
+class SolverStats:
+    """Work counters for solver runs. Hot paths only check `enabled` while it is off."""
+
+    __slots__ = ("enabled", "pattern_calls", "patterns_scored", "filter_calls", "candidates_scanned",
+                 "nodes_pushed", "nodes_expanded", "nodes_deduplicated", "turn_times")
+
+    def __init__(self):
+        self.enabled = False
+        self.reset()
+
+    def reset(self) -> None:
+        self.pattern_calls = 0
+        self.patterns_scored = 0
+        self.filter_calls = 0
+        self.candidates_scanned = 0
+        self.nodes_pushed = 0
+        self.nodes_expanded = 0
+        self.nodes_deduplicated = 0
+        self.turn_times = []
+
+    def record_turn(self, start: float) -> None:
+        """Record a solver turn that began at perf_counter() time `start`."""
+        if self.enabled:
+            self.turn_times.append(time.perf_counter() - start)
+
+    def snapshot(self) -> dict:
+        return {
+            "pattern_calls": self.pattern_calls,
+            "patterns_scored": self.patterns_scored,
+            "filter_calls": self.filter_calls,
+            "candidates_scanned": self.candidates_scanned,
+            "nodes_pushed": self.nodes_pushed,
+            "nodes_expanded": self.nodes_expanded,
+            "nodes_deduplicated": self.nodes_deduplicated,
+            "turn_times": list(self.turn_times),
+        }
+
+
+STATS = SolverStats()
+
+
+def enable_instrumentation(enabled: bool = True) -> None:
+    STATS.enabled = enabled
+    STATS.reset()
+
+#DEADLINES AND CANCELLATION
+# A deadline is a time.perf_counter() value, or None for no limit.
+
+
+def make_deadline(time_budget: float = None):
+    return None if time_budget is None else time.perf_counter() + time_budget
+
+
+def time_left(deadline) -> float:
+    return float("inf") if deadline is None else deadline - time.perf_counter()
+
+
+def expired(deadline) -> bool:
+    return deadline is not None and time.perf_counter() >= deadline
+
+
+class CancelToken:
+    """Set from another thread to ask a running solve to stop; solvers check it between turns."""
+
+    __slots__ = ("_event",)
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+def is_cancelled(cancel) -> bool:
+    return cancel is not None and cancel.cancelled
+
+
+class SolveHistory(list):
+    """(guess, pattern) turns of a solve. completed[i] is False if turn i was decided in a hurry
+    because the deadline ran out."""
+
+    def __init__(self, turns=(), completed: bool = True):
+        super().__init__(turns)
+        self.completed = [completed] * len(self)
+
+    def record(self, guess: str, pattern: int, completed: bool = True) -> None:
+        self.append((guess, pattern))
+        self.completed.append(completed)
+
+    @property
+    def cut_short(self) -> int:
+        """Number of turns cut short by the deadline."""
+        return self.completed.count(False)
+
+
+def run_steps(steps: Iterator[Tuple[str, int]]) -> SolveHistory:
+    """Drain a solver's iter_solve() generator and return the SolveHistory it returns."""
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
 
 #CORE LOGIC
+# A pattern is a base-3 integer code 0..242: one digit per letter (0 absent,
+# 1 present, 2 correct), first letter is the most significant digit.
+
+ALL_GREEN = 242
+
+# Code -> tuple lookup, e.g. 242 -> (2, 2, 2, 2, 2)
+_PATTERN_TUPLES = [tuple((code // 3 ** (4 - i)) % 3 for i in range(5)) for code in range(3 ** 5)]
+
+
+def decode_pattern(code: int) -> Tuple[int, ...]:
+    """Per-letter feedback tuple for a pattern code (used for colouring)."""
+    return _PATTERN_TUPLES[code]
+
+
+def encode_pattern(pattern: Tuple[int, ...]) -> int:
+    return pattern[0] * 81 + pattern[1] * 27 + pattern[2] * 9 + pattern[3] * 3 + pattern[4]
+
 
-def get_pattern(guess: str, target: str) -> Tuple[int, ...]:
+def _compute_pattern(guess: str, target: str) -> int:
     guess = guess.lower()
     target = target.lower()
     
@@ -72,8 +357,504 @@ def get_pattern(guess: str, target: str) -> Tuple[int, ...]:
             else:
                 pattern[i] = 0
                 
-    return tuple(pattern)
+    return encode_pattern(pattern)
+
+
+#PATTERN MATRIX
+# Feedback for every (guess, target) pair of WORD_LIST, one uint8 code per cell.
+
+PATTERN_BLOCK_SIZE = 256
+
+_PATTERN_MATRIX = None
+_PATTERN_MATRIX_LOCK = threading.Lock()
+
+
+def encode_words(words: List[str]) -> np.ndarray:
+    """Encode words as an (n, 5) uint8 array of letters."""
+    if not words:
+        return np.zeros((0, 5), dtype=np.uint8)
+    return np.frombuffer("".join(words).encode("ascii"), dtype=np.uint8).reshape(-1, 5)
+
+
+def letter_counts(targets: np.ndarray) -> np.ndarray:
+    """(26, n) count of each letter in each encoded target."""
+    counts = np.zeros((26, len(targets)), dtype=np.int8)
+    cols = np.arange(len(targets))
+    for i in range(5):
+        np.add.at(counts, (targets[:, i] - ord("a"), cols), 1)
+    return counts
+
+
+def compute_pattern_block(guesses: np.ndarray, targets: np.ndarray, counts: np.ndarray = None) -> np.ndarray:
+    """Pattern codes for every guess (rows) against every target (columns)."""
+    if counts is None:
+        counts = letter_counts(targets)
+    out = np.empty((len(guesses), len(targets)), dtype=np.uint8)
+    for row, letters in enumerate(guesses.tolist()):
+        letters = [c - ord("a") for c in letters]
+        green = [targets[:, i] == letters[i] + ord("a") for i in range(5)]
+        code = np.zeros(len(targets), dtype=np.uint8)
+        for i in range(5):
+            same = [j for j in range(5) if letters[j] == letters[i]]
+            if len(same) == 1:
+                yellow = counts[letters[i]] > 0
+            else:
+                # Repeated letter: greens use up copies first, then earlier
+                # non-green occurrences take the remaining ones left to right
+                available = counts[letters[i]] - sum(green[j] for j in same)
+                consumed = sum(~green[j] for j in same if j < i)
+                yellow = available > consumed
+            weight = 3 ** (4 - i)
+            code += green[i] * np.uint8(2 * weight)
+            code += (yellow & ~green[i]) * np.uint8(weight)
+        out[row] = code
+    return out
+
+
+def _fill_pattern_matrix(matrix: np.ndarray, codes: np.ndarray) -> None:
+    counts = letter_counts(codes)
+    for start in range(0, len(codes), PATTERN_BLOCK_SIZE):
+        stop = min(start + PATTERN_BLOCK_SIZE, len(codes))
+        matrix[start:stop] = compute_pattern_block(codes[start:stop], codes, counts)
+
+
+def _build_pattern_matrix(path: Path) -> np.ndarray:
+    """Build the matrix into the cache file and map it, or keep it in memory if the cache is not writable."""
+    codes = encode_words(get_word_list())
+    n = len(codes)
+    # Unique per build, so no other build can truncate the file while it is mapped
+    tmp_path = path.with_suffix(f".{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        matrix = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.uint8, shape=(n, n))
+        _fill_pattern_matrix(matrix, codes)
+        matrix.flush()
+        del matrix
+        # Atomic rename so concurrent processes never map a half-written file
+        os.replace(tmp_path, path)
+    except OSError:
+        # Read-only checkout: rebuild in memory every process
+        try:
+            tmp_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+        matrix = np.empty((n, n), dtype=np.uint8)
+        _fill_pattern_matrix(matrix, codes)
+        return matrix
+    return np.load(path, mmap_mode="r")
+
+
+def pattern_matrix_path() -> Path:
+    return CACHE_DIR / f"patterns_{dictionary_hash()[:16]}_{len(get_word_list())}.npy"
+
+
+def get_pattern_matrix() -> np.ndarray:
+    """Memory-mapped pattern matrix, built and cached on first use (once, even across threads)."""
+    global _PATTERN_MATRIX
+    if _PATTERN_MATRIX is None:
+        with _PATTERN_MATRIX_LOCK:
+            if _PATTERN_MATRIX is None:
+                path = pattern_matrix_path()
+                if path.exists():
+                    matrix = np.load(path, mmap_mode="r")
+                else:
+                    print(f"Building pattern matrix cache at {path} (one-time)...")
+                    matrix = _build_pattern_matrix(path)
+                # Plain ndarray view of the mapping: same pages, no memmap indexing overhead
+                _PATTERN_MATRIX = matrix.view(np.ndarray)
+    return _PATTERN_MATRIX
+
+
+def get_pattern(guess: str, target: str) -> int:
+    if STATS.enabled:
+        STATS.pattern_calls += 1
+    # Only use the matrix once something has loaded it, so a single call
+    # (e.g. revealing a row in the GUI) never waits for the one-time build.
+    if _PATTERN_MATRIX is not None:
+        index = get_word_index()
+        gi = index.get(guess.lower())
+        ti = index.get(target.lower())
+        if gi is not None and ti is not None:
+            return int(_PATTERN_MATRIX[gi, ti])
+    return _compute_pattern(guess, target)
+
+
+#CANDIDATE SETS
+
+def _n_blocks() -> int:
+    return (len(get_word_list()) + 63) // 64
+
+
+class CandidateSet:
+    """Subset of WORD_LIST stored as a bitset (one bit per word, in list order)."""
+
+    __slots__ = ("bits", "_indices", "_count", "_hash")
+
+    def __init__(self, bits: np.ndarray):
+        self.bits = bits
+        self._indices = None
+        self._count = None
+        self._hash = None
+
+    @classmethod
+    def full(cls) -> "CandidateSet":
+        return cls.from_indices(np.arange(len(get_word_list())))
+
+    @classmethod
+    def empty(cls) -> "CandidateSet":
+        return cls(np.zeros(_n_blocks(), dtype=np.uint64))
+
+    @classmethod
+    def from_indices(cls, indices: np.ndarray) -> "CandidateSet":
+        mask = np.zeros(_n_blocks() * 64, dtype=bool)
+        mask[indices] = True
+        return cls(np.packbits(mask, bitorder="little").view(np.uint64))
+
+    @classmethod
+    def from_mask(cls, mask: np.ndarray) -> "CandidateSet":
+        """Build from a bool array aligned with WORD_LIST."""
+        padded = np.zeros(_n_blocks() * 64, dtype=bool)
+        padded[:len(mask)] = mask
+        return cls(np.packbits(padded, bitorder="little").view(np.uint64))
+
+    @classmethod
+    def from_words(cls, words: Sequence[str]) -> "CandidateSet":
+        index = get_word_index()
+        return cls.from_indices(np.array([index[w] for w in words], dtype=np.intp))
+
+    @property
+    def indices(self) -> np.ndarray:
+        """Sorted WORD_LIST indices of the members."""
+        if self._indices is None:
+            mask = np.unpackbits(self.bits.view(np.uint8), bitorder="little")
+            self._indices = np.flatnonzero(mask)
+        return self._indices
+
+    def words(self) -> List[str]:
+        word_list = get_word_list()
+        return [word_list[i] for i in self.indices]
+
+    def mask(self) -> np.ndarray:
+        """Bool array aligned with WORD_LIST."""
+        return np.unpackbits(self.bits.view(np.uint8), bitorder="little")[:len(get_word_list())].astype(bool)
+
+    def __len__(self) -> int:
+        if self._count is None:
+            if hasattr(np, "bitwise_count"):
+                self._count = int(np.bitwise_count(self.bits).sum())
+            else:
+                # NumPy < 2.0 has no popcount ufunc
+                self._count = int(np.unpackbits(self.bits.view(np.uint8)).sum())
+        return self._count
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.words())
+
+    def __contains__(self, word: str) -> bool:
+        idx = get_word_index().get(word)
+        if idx is None:
+            return False
+        return bool((int(self.bits[idx >> 6]) >> (idx & 63)) & 1)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            word_list = get_word_list()
+            return [word_list[i] for i in self.indices[key]]
+        return get_word_list()[self.indices[key]]
+
+    def __and__(self, other: "CandidateSet") -> "CandidateSet":
+        return CandidateSet(self.bits & other.bits)
+
+    def __or__(self, other: "CandidateSet") -> "CandidateSet":
+        return CandidateSet(self.bits | other.bits)
+
+    def __sub__(self, other: "CandidateSet") -> "CandidateSet":
+        return CandidateSet(self.bits & ~other.bits)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CandidateSet):
+            return NotImplemented
+        return self is other or np.array_equal(self.bits, other.bits)
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(self.bits.tobytes())
+        return self._hash
+
+    def fingerprint(self) -> str:
+        """Stable digest of the membership bits (unlike hash(), the same across processes)."""
+        return hashlib.blake2b(self.bits.tobytes(), digest_size=16).hexdigest()
+
+    def __repr__(self) -> str:
+        return f"CandidateSet({len(self)} words)"
+
+
+Words = Union[CandidateSet, Sequence[str]]
+
+
+def _word_indices(words: Words):
+    """Dictionary indices for words, or None if any word is not in WORD_LIST."""
+    if isinstance(words, CandidateSet):
+        return words.indices
+    index = get_word_index()
+    indices = np.empty(len(words), dtype=np.intp)
+    for i, w in enumerate(words):
+        idx = index.get(w)
+        if idx is None:
+            return None
+        indices[i] = idx
+    return indices
+
+
+def get_patterns_many(guesses: Words, targets: Words) -> np.ndarray:
+    """(len(guesses), len(targets)) uint8 array of pattern codes."""
+    if STATS.enabled:
+        STATS.patterns_scored += len(guesses) * len(targets)
+    gi = _word_indices(guesses)
+    ti = _word_indices(targets)
+    if gi is not None and ti is not None:
+        return get_pattern_matrix()[np.ix_(gi, ti)]
+    guess_codes = encode_words([g.lower() for g in guesses])
+    return compute_pattern_block(guess_codes, encode_words([t.lower() for t in targets]))
+
+
+def get_patterns(guess: str, targets: Words) -> np.ndarray:
+    """uint8 array with the pattern code of guess against each target."""
+    gi = get_word_index().get(guess)
+    ti = _word_indices(targets)
+    if gi is not None and ti is not None:
+        if STATS.enabled:
+            STATS.patterns_scored += len(ti)
+        return get_pattern_matrix()[gi][ti]
+    return get_patterns_many([guess], targets)[0]
+
+
+HISTOGRAM_CHUNK_CELLS = 4_000_000
+
+
+def pattern_histograms(guess_indices: np.ndarray, candidates: CandidateSet) -> np.ndarray:
+    """(len(guess_indices), 243) count of candidates falling in each pattern bucket."""
+    matrix = get_pattern_matrix()
+    cand = candidates.indices
+    if STATS.enabled:
+        STATS.patterns_scored += len(guess_indices) * len(cand)
+    out = np.empty((len(guess_indices), 3 ** 5), dtype=np.int64)
+    # Chunk guesses so the gathered block stays a few MB even for 15k x 15k
+    step = max(1, HISTOGRAM_CHUNK_CELLS // max(1, len(cand)))
+    for start in range(0, len(guess_indices), step):
+        rows = guess_indices[start:start + step]
+        codes = matrix[np.ix_(rows, cand)].astype(np.intp)
+        codes += (np.arange(len(rows)) * 3 ** 5)[:, None]
+        out[start:start + len(rows)] = np.bincount(codes.ravel(), minlength=len(rows) * 3 ** 5).reshape(len(rows), -1)
+    return out
+
+
+def get_word_codes() -> np.ndarray:
+    """(len(WORD_LIST), 5) encoded letters of every dictionary word."""
+    return get_lexicon().codes
+
+
+def get_letter_counts() -> np.ndarray:
+    """(26, len(WORD_LIST)) letter counts of every dictionary word."""
+    return get_lexicon().letter_counts
+
+
+def split_by_feedback(guess: str, targets: Sequence[str], positions: Sequence[int]) -> Dict[int, List[int]]:
+    """Group target positions by the pattern `guess` gives them (patterns in first-seen order)."""
+    groups: Dict[int, List[int]] = {}
+    patterns = get_patterns(guess, [targets[i] for i in positions]).tolist()
+    for pos, pattern in zip(positions, patterns):
+        groups.setdefault(pattern, []).append(pos)
+    return groups
+
+
+#ANSWER INDEX
+# (guess, pattern) -> set of answers giving that pattern, built lazily.
+
+ANSWER_INDEX_MAX_BYTES = 64 * 1024 * 1024
+
+
+class LRUCache:
+    """Least-recently-used cache bounded by the total cost of its values."""
+
+    def __init__(self, max_cost: int, cost: Callable = lambda value: 1):
+        self.max_cost = max_cost
+        self.cost = cost
+        self.total_cost = 0
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def get(self, key: Hashable, default=None):
+        if key in self._data:
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+        self.misses += 1
+        return default
+
+    def put(self, key: Hashable, value) -> None:
+        if key in self._data:
+            self.total_cost -= self.cost(self._data.pop(key))
+        self._data[key] = value
+        self.total_cost += self.cost(value)
+        while self.total_cost > self.max_cost and len(self._data) > 1:
+            _, evicted = self._data.popitem(last=False)
+            self.total_cost -= self.cost(evicted)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.total_cost = 0
+
+    def items(self) -> List[tuple]:
+        """(key, value) pairs from least to most recently used."""
+        return list(self._data.items())
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_ANSWER_INDEX = LRUCache(ANSWER_INDEX_MAX_BYTES, cost=lambda cs: cs.bits.nbytes)
+
+
+def answer_set(guess: str, pattern: int) -> CandidateSet:
+    """All words in WORD_LIST that give `pattern` for `guess` (must be in WORD_LIST)."""
+    gi = get_word_index()[guess]
+    key = (gi, pattern)
+    answers = _ANSWER_INDEX.get(key)
+    if answers is None:
+        answers = CandidateSet.from_mask(get_pattern_matrix()[gi] == pattern)
+        _ANSWER_INDEX.put(key, answers)
+    return answers
+
+
+def clear_answer_index() -> None:
+    _ANSWER_INDEX.clear()
+
+
+#CONSTRAINTS
+# Feedback compiled into green letters, per-position exclusions and letter
+# count bounds. A word passes a (guess, pattern) pair exactly when
+# get_pattern(guess, word) == pattern, so this matches chained filter_words.
+
+class Constraints:
+    """Constraints accumulated from a guess history, updated one guess at a time."""
+
+    def __init__(self):
+        self.greens: List[str] = [None] * 5
+        self.excluded: List[set] = [set() for _ in range(5)]
+        self.min_counts: Dict[str, int] = {}
+        self.max_counts: Dict[str, int] = {}
+        self.feasible = True
+        self._candidates = None
+
+    @classmethod
+    def from_history(cls, history: Sequence[Tuple[str, int]]) -> "Constraints":
+        constraints = cls()
+        for guess, pattern in history:
+            constraints.add(guess, pattern)
+        return constraints
+
+    @property
+    def candidates(self) -> CandidateSet:
+        """Dictionary words satisfying every constraint so far."""
+        if self._candidates is None:
+            self._candidates = CandidateSet.empty() if not self.feasible else self._query()
+        return self._candidates
+
+    def add(self, guess: str, pattern: int) -> None:
+        guess = guess.lower()
+        marks = decode_pattern(pattern)
+        marked = Counter()
+        grayed = set()
+        for i, (char, mark) in enumerate(zip(guess, marks)):
+            if mark == 2:
+                if self.greens[i] not in (None, char):
+                    self.feasible = False
+                self.greens[i] = char
+            else:
+                self.excluded[i].add(char)
+            if mark == 1 and char in grayed:
+                # get_pattern marks the leftmost copies yellow, never a gray before a yellow
+                self.feasible = False
+            if mark:
+                marked[char] += 1
+            else:
+                grayed.add(char)
+
+        for char in set(guess):
+            count = marked[char]
+            self.min_counts[char] = max(self.min_counts.get(char, 0), count)
+            if char in grayed:
+                self.max_counts[char] = min(self.max_counts.get(char, 5), count)
+            if self.min_counts[char] > self.max_counts.get(char, 5):
+                self.feasible = False
+
+        if self._candidates is not None:
+            self._candidates = self._candidates & feedback_set(guess, pattern) if self.feasible else CandidateSet.empty()
+
+    def matches(self, word: str) -> bool:
+        """Cheap per-word check, also valid for words outside the dictionary."""
+        if not self.feasible:
+            return False
+        for i, char in enumerate(word):
+            if self.greens[i] is not None and self.greens[i] != char:
+                return False
+            if char in self.excluded[i]:
+                return False
+        for char, low in self.min_counts.items():
+            if word.count(char) < low:
+                return False
+        for char, high in self.max_counts.items():
+            if word.count(char) > high:
+                return False
+        return True
+
+    def _query(self) -> CandidateSet:
+        lexicon = get_lexicon()
+        result = CandidateSet.full()
+        for i in range(5):
+            if self.greens[i] is not None:
+                result = result & lexicon.with_letter_at(self.greens[i], i)
+            for char in self.excluded[i]:
+                result = result - lexicon.with_letter_at(char, i)
+        for char, low in self.min_counts.items():
+            result = result & lexicon.with_min_count(char, low)
+        for char, high in self.max_counts.items():
+            result = result - lexicon.with_min_count(char, high + 1)
+        return result
+
+
+def feedback_set(guess: str, pattern: int) -> CandidateSet:
+    """Dictionary words consistent with one (guess, pattern), from the lexicon indexes."""
+    constraints = Constraints()
+    constraints.add(guess, pattern)
+    return constraints.candidates
+
 
+def filter_words(words: Words, guess: str, pattern: int) -> Words:
+    if STATS.enabled:
+        STATS.filter_calls += 1
+        STATS.candidates_scanned += len(words)
+    if isinstance(words, CandidateSet):
+        if guess in get_word_index():
+            return words & answer_set(guess, pattern)
+        return words & feedback_set(guess, pattern)
 
-def filter_words(words: List[str], guess: str, pattern: Tuple[int, ...]) -> List[str]:
-    return [word for word in words if get_pattern(guess, word) == pattern]
\ No newline at end of file
+    keep = get_patterns(guess, words) == pattern
+    return [word for word, ok in zip(words, keep) if ok]
@@ -1,19 +1,38 @@
 import tkinter as tk
 from tkinter import ttk
-import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor
 import random
 import time
+import traceback
 from typing import List, Tuple, Optional
 
 # Import module game_logic
-from game_logic import ROWS, COLS, WORD_LIST, get_pattern, filter_words, \
+from game_logic import ROWS, COLS, ALL_GREEN, CancelToken, CandidateSet, Constraints, get_word_list, get_lexicon, get_pattern, decode_pattern, \
                        COLOR_CORRECT, COLOR_PRESENT, COLOR_ABSENT, \
                        BG, EMPTY_BG, EMPTY_BORDER, EMPTY_TEXT, KEY_BG, KEY_ACTIVE_BG, COLOR_TEXT_FILLED
 
-from solvers import bfs_solver, dfs_solver, ucs_solver, astar_solver
+from solvers import bfs_solver, dfs_solver, ucs_solver, astar_solver, tree_solver, optimal_solver
+from solvers.heuristics import HEURISTICS
 
 CELL_SIZE = 55
 REVEAL_DELAY_MS = 200
+# AUTO SOLVE: how often the GUI checks for new solver steps, and the least time between shown rows
+SOLVER_POLL_MS = 30
+ROW_MIN_INTERVAL_MS = 400
+
+# Suggestions shown in hint mode
+HINT_COUNT = 5
+
+# Step-wise solvers behind the Algorithm dropdown
+AUTO_SOLVERS = {
+    "BFS": bfs_solver.iter_solve,
+    "DFS": dfs_solver.iter_solve,
+    "UCS": ucs_solver.iter_solve,
+    "A*": astar_solver.iter_solve,
+    "A* Tree": tree_solver.iter_solve,
+    "Optimal": optimal_solver.iter_solve
+}
 
 class WordleGame:
     def __init__(self, root: tk.Tk):
@@ -40,12 +59,45 @@ class WordleGame:
         self.message_label: Optional[tk.Label] = None
         self.key_buttons: dict = {}
 
+        # AUTO SOLVE runs on one worker thread. Its steps come back through one queue, tagged
+        # with the game generation they belong to, so a solve for an old game is never shown.
+        self.solver_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="solver")
+        self.solver_steps = queue.Queue()
+        self.generation = 0
+        self.cancel_token: Optional[CancelToken] = None
+        self.solving = False
+        self.solver_rows_shown = 0
+        self.solver_failed = False
+        self.last_row_time = 0.0
+        # Hint rankings are also computed on the worker; only the latest request is shown
+        self.hint_results = queue.Queue()
+        self.hint_request = 0
+
         self.setup_ui()
         self.start_new_game()
+        self.root.after(SOLVER_POLL_MS, self._poll_solver)
         
         # Bind physical keyboard
         self.root.bind("<Key>", self.on_key_press)
 
+        # Keep A* decisions across sessions
+        astar_solver.load_best_guess_cache()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        # Rank the opening hints on the worker (building the pattern matrix on a first launch),
+        # so turning hints on is instant and the window never waits
+        self.solver_pool.submit(self._rank_in_background, None, CandidateSet.full(), self.heuristic_var.get())
+
+    def on_close(self):
+        if self.cancel_token is not None:
+            self.cancel_token.cancel()
+        self.solver_pool.shutdown(wait=False, cancel_futures=True)
+        try:
+            astar_solver.save_best_guess_cache()
+        except OSError as e:
+            print(f"Could not save best-guess cache: {e}")
+        self.root.destroy()
+
     def setup_ui(self):
         title_label = tk.Label(self.root, text="WORDLE AI", font=("Helvetica", 40, "bold"), bg=BG, fg="white")
         title_label.pack(pady=(20, 4))
@@ -53,6 +105,9 @@ class WordleGame:
         self.message_label = tk.Label(self.root, text="", font=("Helvetica", 14), bg=BG, fg=EMPTY_TEXT)
         self.message_label.pack(pady=(0, 6))
 
+        self.hint_label = tk.Label(self.root, text="", font=("Helvetica", 11), bg=BG, fg=EMPTY_TEXT)
+        self.hint_label.pack()
+
         # Grid
         self.grid_frame = tk.Frame(self.root, bg=BG)
         self.grid_frame.pack(pady=(6, 18))
@@ -86,7 +141,7 @@ class WordleGame:
         # Algorithm Dropdown
         self.algo_var = tk.StringVar()
         self.algo_combo = ttk.Combobox(control_frame, textvariable=self.algo_var, 
-                                       values=["BFS", "DFS", "UCS", "A*"], 
+                                       values=list(AUTO_SOLVERS), 
                                        state="readonly", font=("Helvetica", 11), width=8)
         self.algo_combo.current(3) # Default to A*
         self.algo_combo.grid(row=0, column=2, padx=5)
@@ -96,6 +151,24 @@ class WordleGame:
                               font=("Helvetica", 12, "bold"), bg="#b59f3b", fg="white", width=12)
         btn_solve.grid(row=0, column=3, padx=10)
 
+        # Heuristic Dropdown (used by A*, A* Tree and Optimal)
+        lbl_heuristic = tk.Label(control_frame, text="Heuristic:", font=("Helvetica", 12), bg=BG, fg="white")
+        lbl_heuristic.grid(row=1, column=1, padx=5, pady=(8, 0))
+
+        self.heuristic_var = tk.StringVar(value=astar_solver.HEURISTIC)
+        self.heuristic_combo = ttk.Combobox(control_frame, textvariable=self.heuristic_var,
+                                            values=list(HEURISTICS),
+                                            state="readonly", font=("Helvetica", 11), width=14)
+        self.heuristic_combo.grid(row=1, column=2, columnspan=2, sticky="w", padx=5, pady=(8, 0))
+
+        # Hint mode
+        self.hint_var = tk.BooleanVar(value=False)
+        hint_check = tk.Checkbutton(control_frame, text="HINTS", variable=self.hint_var, command=self.refresh_hint,
+                                    font=("Helvetica", 12, "bold"), bg=BG, fg="white", selectcolor=BG,
+                                    activebackground=BG, activeforeground="white")
+        hint_check.grid(row=1, column=0, padx=10, pady=(8, 0))
+        self.heuristic_combo.bind("<<ComboboxSelected>>", lambda event: self.on_heuristic_change())
+
         # Keyboard
         self.setup_keyboard()
 
@@ -129,15 +202,25 @@ class WordleGame:
         back_btn.pack(side="left", padx=2)
 
     def start_new_game(self):
-        self.target_word = random.choice(WORD_LIST)
+        self.target_word = random.choice(get_word_list())
         print(f"DEBUG: Secret Word is {self.target_word}")
         
         self.current_guess_num = 0
         self.current_guess_str = ""
         self.game_over = False
         self.revealing = False
+        # Stop an AUTO SOLVE still running for the previous game; its late steps are dropped
+        self.generation += 1
+        if self.cancel_token is not None:
+            self.cancel_token.cancel()
+        self.solving = False
         self.message_label.config(text="")
 
+        # Constraints from the revealed rows; their candidates come from the lexicon bitsets,
+        # so the Tk thread never touches (or waits to build) the pattern matrix
+        self.hint_constraints = Constraints()
+        self.refresh_hint()
+
         # Reset
         for row in range(ROWS):
             for col in range(COLS):
@@ -190,7 +273,7 @@ class WordleGame:
             return
         
         guess_lower = self.current_guess_str.lower()
-        if guess_lower not in WORD_LIST:
+        if guess_lower not in get_lexicon():
             self.message_label.config(text="Not in word list!", fg="#ff6b6b")
             return
         
@@ -222,13 +305,14 @@ class WordleGame:
         self.revealing = True
         guess = self.current_guess_str.lower()
         pattern = get_pattern(guess, self.target_word)
+        marks = decode_pattern(pattern)
         
         # Animate color reveal
         for col in range(COLS):
             color = COLOR_ABSENT
-            if pattern[col] == 2:
+            if marks[col] == 2:
                 color = COLOR_CORRECT
-            elif pattern[col] == 1:
+            elif marks[col] == 1:
                 color = COLOR_PRESENT
             
             delay = col * REVEAL_DELAY_MS
@@ -256,9 +340,10 @@ class WordleGame:
     def _finish_guess(self, pattern):
         """Finish the current guess and check game state"""
         self.revealing = False
+        self.update_hint(self.current_guess_str.lower(), pattern)
         
         # Check win
-        if pattern == (2, 2, 2, 2, 2):
+        if pattern == ALL_GREEN:
             self.message_label.config(text=f"🎉 You won! The word was {self.target_word.upper()}!", fg=COLOR_CORRECT)
             self.game_over = True
             return
@@ -272,47 +357,118 @@ class WordleGame:
             self.message_label.config(text=f"Game Over! The word was {self.target_word.upper()}", fg="#ff6b6b")
             self.game_over = True
     
+    def on_heuristic_change(self):
+        # The next AUTO SOLVE picks the heuristic up; one already running keeps its own
+        self.refresh_hint()
+
+    def update_hint(self, guess: str, pattern: int):
+        """Add one revealed row to the constraints; candidates are only narrowed once hints are shown."""
+        self.hint_constraints.add(guess, pattern)
+        self.refresh_hint()
+
+    def refresh_hint(self):
+        if not self.hint_var.get():
+            self.hint_label.config(text="")
+            return
+        candidates = self.hint_constraints.candidates
+        remaining = len(candidates)
+        if remaining == 0:
+            self.hint_label.config(text="No candidates left")
+            return
+
+        # Rank on the worker; _poll_solver shows the result
+        self.hint_request += 1
+        self.hint_label.config(text=f"{remaining} candidates left | Ranking...")
+        self.solver_pool.submit(self._rank_in_background, self.hint_request, candidates,
+                                self.heuristic_var.get())
+
+    def _rank_in_background(self, request, candidates, heuristic):
+        # Ranked lists are cached per candidate set and heuristic, so repeats are instant
+        try:
+            suggestions = astar_solver.top_guesses(candidates, HINT_COUNT, heuristic=heuristic)
+        except Exception:
+            traceback.print_exc()
+            return
+        if request is not None:
+            self.hint_results.put((request, len(candidates), suggestions))
+
+    def _show_hint(self, request, remaining, suggestions):
+        if request != self.hint_request or not self.hint_var.get():
+            return
+        text = "  ".join(f"{word.upper()} {score:.2f}" for word, score in suggestions)
+        self.hint_label.config(text=f"{remaining} candidates left | Try: {text}")
+
     def run_auto_solve(self):
-        if self.game_over or self.revealing: return
+        # One AUTO SOLVE at a time
+        if self.game_over or self.revealing or self.solving: return
         
         algo_name = self.algo_var.get()
         self.message_label.config(text=f"AI is thinking ({algo_name})...", fg=COLOR_PRESENT)
         
-        # Run algorithm in a separate thread to avoid freezing the UI
-        threading.Thread(target=self._solve_in_background, args=(algo_name,), daemon=True).start()
-
-    def _solve_in_background(self, algo_name):
-        target = self.target_word
-        history = []
-
-        if algo_name == "BFS":
-            history = bfs_solver.solve(target)
-        elif algo_name == "DFS":
-            history = dfs_solver.solve(target)
-        elif algo_name == "UCS":
-            history = ucs_solver.solve(target)
-        elif algo_name == "A*":
-            history = astar_solver.solve(target)
-
-        if history:
-            self.root.after(0, lambda: self._animate_solution(history))
-        else:
-            self.root.after(0, lambda: self.message_label.config(text="AI Failed to find word!", fg="red"))
-
-    def _animate_solution(self, history):
+        # Solve on the worker thread to avoid freezing the UI; _poll_solver shows the steps
         self.current_guess_num = 0
-        
-        delay_step = 0
-        for guess, pattern in history:
-            # Schedule each guess step
-            self.root.after(delay_step, lambda g=guess, p=pattern: self._fill_and_color_row(g, p))
-            delay_step += 1500
+        self.hint_constraints = Constraints()
+        self.solver_rows_shown = 0
+        self.solver_failed = False
+        self.solving = True
+        self.cancel_token = CancelToken()
+        self.solver_pool.submit(self._solve_in_background, AUTO_SOLVERS[algo_name], self.target_word,
+                                self.generation, self.cancel_token, self.heuristic_var.get())
+
+    def _solve_in_background(self, iter_solve, target, generation, cancel, heuristic):
+        try:
+            # Set on the worker, between jobs, so a solve never changes heuristic mid-game
+            astar_solver.HEURISTIC = heuristic
+            for step in iter_solve(target, cancel=cancel):
+                if cancel.cancelled:
+                    break
+                self.solver_steps.put((generation, step))
+        except Exception as e:
+            # Nothing waits on the future, so report the failure here
+            traceback.print_exc()
+            self.solver_steps.put((generation, e))
+        finally:
+            self.solver_steps.put((generation, None))
+
+    def _poll_solver(self):
+        """Show AUTO SOLVE steps as they arrive, at most one row per ROW_MIN_INTERVAL_MS.
+        Steps from an earlier game are dropped. Also shows finished hint rankings."""
+        while True:
+            try:
+                self._show_hint(*self.hint_results.get_nowait())
+            except queue.Empty:
+                break
+
+        while time.monotonic() - self.last_row_time >= ROW_MIN_INTERVAL_MS / 1000:
+            try:
+                generation, step = self.solver_steps.get_nowait()
+            except queue.Empty:
+                break
+            if generation != self.generation:
+                continue
+
+            if step is None:
+                self.solving = False
+                if self.solver_rows_shown == 0 and not self.solver_failed:
+                    self.message_label.config(text="AI Failed to find word!", fg="red")
+            elif isinstance(step, Exception):
+                self.solver_failed = True
+                self.message_label.config(text=f"AI crashed: {step}", fg="red")
+                continue
+            else:
+                self._fill_and_color_row(*step)
+                self.solver_rows_shown += 1
+                self.last_row_time = time.monotonic()
+            break
+
+        self.root.after(SOLVER_POLL_MS, self._poll_solver)
 
     def _fill_and_color_row(self, guess, pattern):
         row = self.current_guess_num
         if row >= ROWS: return
 
         guess = guess.upper()
+        marks = decode_pattern(pattern)
     
         for col in range(COLS):
             _, lbl = self.cells[row][col]
@@ -320,8 +476,8 @@ class WordleGame:
 
         for col in range(COLS):
             color = COLOR_ABSENT
-            if pattern[col] == 2: color = COLOR_CORRECT
-            elif pattern[col] == 1: color = COLOR_PRESENT
+            if marks[col] == 2: color = COLOR_CORRECT
+            elif marks[col] == 1: color = COLOR_PRESENT
             
             frame, lbl = self.cells[row][col]
             lbl.config(bg=color, fg=COLOR_TEXT_FILLED)
@@ -331,8 +487,9 @@ class WordleGame:
                 self.key_buttons[guess[col]].config(bg=color)
 
         self.current_guess_num += 1
+        self.update_hint(guess.lower(), pattern)
         
-        if pattern == (2, 2, 2, 2, 2):
+        if pattern == ALL_GREEN:
             self.message_label.config(text=f"AI WON using {self.algo_var.get()}!", fg=COLOR_CORRECT)
             self.game_over = True
 
@@ -0,0 +1,156 @@
+import sys
+import json
+import time
+import random
+import statistics
+import argparse
+import platform
+from pathlib import Path
+from typing import Callable, Dict
+
+# Import logic game
+sys.path.append(str(Path(__file__).parent))
+
+from game_logic import CandidateSet, get_word_list, get_pattern, filter_words, load_word_list, get_pattern_matrix, \
+                       clear_answer_index
+from solvers.astar_solver import calculate_entropy
+
+#MICRO-BENCHMARK CONFIGURATION
+BASELINE_FILE = Path(__file__).parent / "data" / "microbench_baseline.json"
+DEFAULT_THRESHOLD = 1.5
+# Slowdowns smaller than this (seconds per call) are timer and scheduler noise, whatever the ratio
+DEFAULT_NOISE_FLOOR = 50e-6
+SIZES = {"full": None, "1k": 1000, "100": 100, "10": 10}
+GUESS = "crane"
+SEED = 420
+MIN_RUN_TIME = 0.2
+REPEATS = 9
+# Primitives over the threshold are re-timed this many times; the fastest median counts,
+# so one burst of machine load cannot fail the gate
+CONFIRM_RUNS = 2
+# A new baseline is the per-primitive median of this many suite runs, so it is not one lucky run
+BASELINE_RUNS = 3
+
+
+def time_call(func: Callable) -> float:
+    """Median per-call time in seconds over REPEATS runs of an auto-sized loop."""
+    func()
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        if time.perf_counter() - start >= MIN_RUN_TIME:
+            break
+        loops *= 2
+
+    times = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        times.append((time.perf_counter() - start) / loops)
+    return statistics.median(times)
+
+
+def candidate_sets() -> Dict[str, CandidateSet]:
+    rng = random.Random(SEED)
+    sets = {}
+    for name, size in SIZES.items():
+        if size is None:
+            sets[name] = CandidateSet.full()
+        else:
+            sets[name] = CandidateSet.from_words(rng.sample(get_word_list(), size))
+    return sets
+
+
+def cold_filter(candidates: CandidateSet) -> Callable:
+    """filter_words over the candidates' real feedback patterns in turn, each with an empty answer-set
+    cache, so every call builds its answer set instead of hitting the cache."""
+    patterns = sorted({get_pattern(GUESS, w) for w in candidates.words()})
+    state = {"i": 0}
+
+    def call():
+        clear_answer_index()
+        pattern = patterns[state["i"] % len(patterns)]
+        state["i"] += 1
+        return filter_words(candidates, GUESS, pattern)
+    return call
+
+
+def suite() -> Dict[str, Callable]:
+    get_pattern_matrix()
+    calls = {"load_word_list": load_word_list}
+
+    for name, candidates in candidate_sets().items():
+        words = candidates.words()
+        calls[f"get_pattern[{name}]"] = lambda words=words: [get_pattern(GUESS, w) for w in words]
+        calls[f"filter_words[{name}]"] = cold_filter(candidates)
+        calls[f"calculate_entropy[{name}]"] = lambda candidates=candidates: calculate_entropy(GUESS, candidates)
+    return calls
+
+
+def run_suite(calls: Dict[str, Callable] = None) -> Dict[str, float]:
+    calls = calls or suite()
+    return {name: time_call(func) for name, func in calls.items()}
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float,
+            noise_floor: float = DEFAULT_NOISE_FLOOR) -> list:
+    """Names of primitives slower than baseline * threshold and more than noise_floor seconds slower."""
+    return [name for name, seconds in results.items()
+            if name in baseline and seconds > baseline[name] * threshold and seconds - baseline[name] > noise_floor]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time game_logic hot paths and check them against a baseline.")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="fail when a primitive is this many times slower than baseline")
+    parser.add_argument("--noise-floor", type=float, default=DEFAULT_NOISE_FLOOR,
+                        help="ignore slowdowns under this many seconds per call")
+    parser.add_argument("--update-baseline", action="store_true", help="overwrite the baseline with this run")
+    args = parser.parse_args(argv)
+
+    calls = suite()
+    if args.update_baseline:
+        runs = [run_suite(calls) for _ in range(BASELINE_RUNS)]
+        results = {name: statistics.median(run[name] for run in runs) for name in calls}
+    else:
+        results = run_suite(calls)
+
+    baseline = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+
+    if not args.update_baseline:
+        for _ in range(CONFIRM_RUNS):
+            suspects = compare(results, baseline, args.threshold, args.noise_floor)
+            if not suspects:
+                break
+            for name, seconds in run_suite({name: calls[name] for name in suspects}).items():
+                results[name] = min(results[name], seconds)
+
+    print(f"{'Primitive':<28}{'Time (us)':>14}{'Baseline (us)':>16}{'Ratio':>8}")
+    for name, seconds in results.items():
+        base = baseline.get(name)
+        ratio = f"{seconds / base:.2f}" if base else "-"
+        base_us = f"{base * 1e6:.1f}" if base else "-"
+        print(f"{name:<28}{seconds * 1e6:>14.1f}{base_us:>16}{ratio:>8}")
+
+    if args.update_baseline:
+        payload = {"python": platform.python_version(), "machine": platform.machine(), "results": results}
+        args.baseline.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold, args.noise_floor)
+    if regressions:
+        print(f"\n❌ Regressed past {args.threshold}x baseline: {', '.join(regressions)}")
+        return 1
+    print("\n✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,74 +1,375 @@
 import sys
+import os
+import json
+import time
 import math
 import heapq
-from collections import Counter
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Tuple
+
+import numpy as np
 
 # Import from game_logic
 sys.path.append(str(Path(__file__).parent.parent))
-from game_logic import WORD_LIST, get_pattern, filter_words
+from game_logic import ALL_GREEN, STATS, CandidateSet, get_pattern, get_patterns, filter_words, split_by_feedback, \
+                       get_word_list, get_lexicon, get_word_codes, get_letter_counts, pattern_histograms, \
+                       LRUCache, CACHE_DIR, dictionary_hash, SolveHistory, run_steps, is_cancelled, make_deadline, \
+                       expired
+from solvers.heuristics import HEURISTICS, IN_LIST_BONUS
 
 
-def calculate_entropy(guess: str, candidates: List[str]) -> float:
-    pattern_counts = Counter()
-    for word in candidates:
-        pattern = get_pattern(guess, word)
-        pattern_counts[pattern] += 1
-        
+def calculate_entropy(guess: str, candidates: CandidateSet) -> float:
+    codes = get_patterns(guess, candidates)
+    # Sum buckets in first-seen order so results match the Counter version exactly
+    _, first, counts = np.unique(codes, return_index=True, return_counts=True)
+    counts = counts[np.argsort(first)].tolist()
+
     total = len(candidates)
     entropy = 0.0
-    for count in pattern_counts.values():
+    for count in counts:
         if count > 0:
             p = count / total
             entropy -= p * math.log2(p)
     return entropy
 
-def find_best_guess_astar(candidates: List[str]) -> str:
-    if len(candidates) <= 2:
-        return candidates[0]
+# Guess pool used by find_best_guess_astar:
+#   "legacy"     - first 20 candidates plus a few strong starters
+#   "candidates" - every remaining candidate
+#   "dictionary" - every word in WORD_LIST (slow on the first turns)
+#   "topk"       - TOP_K words by a cheap letter-frequency score, then exact entropy
+GUESS_POOL = "topk"
+TOP_K = 100
+# Guess scorer from solvers.heuristics.HEURISTICS
+HEURISTIC = "entropy"
+# Guesses scored per step when racing a deadline
+SCORE_CHUNK = 64
+
+# Entropy scoring on big candidate sets:
+#   "exact"   - every candidate
+#   "sampled" - a stratified sample of candidates, doubled until the leader's
+#               confidence interval clears every other guess's
+ENTROPY_ESTIMATOR = "exact"
+SAMPLE_SEED = 0
+SAMPLE_EXACT_BELOW = 1500
+SAMPLE_START = 256
+SAMPLE_MAX = 4096
+SAMPLE_Z = 2.0
+
+# Bump when guess scoring changes so cached and compiled decisions are not reused
+HEURISTIC_VERSION = 1
+
+# Best guess per candidate set, keyed by policy and CandidateSet.fingerprint()
+BEST_GUESS_CACHE_SIZE = 4096
+BEST_GUESS_CACHE_PATH = CACHE_DIR / "best_guess.json"
+_BEST_GUESS_CACHE = LRUCache(BEST_GUESS_CACHE_SIZE)
+
+# Ranked suggestions for the GUI hint mode, keyed like the best-guess cache
+HINT_CACHE_SIZE = 256
+_HINT_CACHE = LRUCache(HINT_CACHE_SIZE)
+
+
+def _prefilter_scores(candidates: CandidateSet) -> np.ndarray:
+    """Cheap split score for every dictionary word: letters/positions near 50% frequency score highest."""
+    counts = get_letter_counts()
+    cand = candidates.indices
+    letter_freq = (counts[:, cand] > 0).mean(axis=1)
+    codes = get_word_codes() - ord("a")
+    position_freq = np.stack([np.bincount(codes[cand, i], minlength=26) for i in range(5)]) / len(cand)
+
+    letter_split = np.minimum(letter_freq, 1 - letter_freq)
+    position_split = np.minimum(position_freq, 1 - position_freq)
+    scores = (counts > 0).T @ letter_split
+    for i in range(5):
+        scores += position_split[i, codes[:, i]]
+    return scores
+
+
+def guess_pool_indices(candidates: CandidateSet, guess_pool: str, top_k: int, scores: np.ndarray = None) -> np.ndarray:
+    if guess_pool == "candidates":
+        return candidates.indices
+    if guess_pool == "dictionary":
+        return np.arange(len(get_word_list()))
+    if guess_pool == "topk":
+        if scores is None:
+            scores = _prefilter_scores(candidates)
+        top = np.argsort(-scores, kind="stable")[:top_k]
+        cand = candidates.indices
+        top_cand = cand[np.argsort(-scores[cand], kind="stable")[:top_k]]
+        return np.union1d(top, top_cand)
+    raise ValueError(f"Unknown guess pool: {guess_pool}")
+
+
+def score_guesses(guess_indices: np.ndarray, candidates: CandidateSet, heuristic: str = None) -> np.ndarray:
+    """HEURISTIC score (entropy plus in-list bonus by default) for each guess, in one vectorized pass."""
+    return HEURISTICS[heuristic or HEURISTIC](pattern_histograms(guess_indices, candidates))
+
 
+def sample_order(candidates: CandidateSet, seed: int = None) -> np.ndarray:
+    """Candidate indices in a seeded order whose every prefix is a stratified sample.
+
+    Strata are first letters: each candidate is placed at a random quantile within
+    its stratum, so any prefix takes every first letter in proportion to its share.
+    """
+    seed = SAMPLE_SEED if seed is None else seed
+    cand = candidates.indices
+    # Seeded per candidate set, so a decision only depends on the set (and caches/compiles like one)
+    rng = np.random.default_rng([seed, int(candidates.fingerprint()[:15], 16)])
+    strata = get_word_codes()[cand, 0]
+    noise = rng.random(len(cand))
+    by_stratum = np.lexsort((noise, strata))
+    sizes = np.bincount(strata, minlength=256)
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    rank = np.empty(len(cand))
+    rank[by_stratum] = np.arange(len(cand)) - starts[strata[by_stratum]]
+    quantile = (rank + rng.random(len(cand))) / sizes[strata]
+    return cand[np.argsort(quantile, kind="stable")]
+
+
+def sampled_entropies(guess_indices: np.ndarray, sample: np.ndarray, population: int):
+    """(estimate, standard error) of each guess's entropy over the population, from a sample of it."""
+    histograms = pattern_histograms(guess_indices, CandidateSet.from_indices(sample))
+    p = histograms / len(sample)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_p = np.where(histograms > 0, np.log2(p), 0.0)
+    entropy = -(p * log_p).sum(axis=1)
+    # Delta-method variance of the plug-in estimate, with finite population correction
+    variance = np.maximum((p * log_p ** 2).sum(axis=1) - entropy ** 2, 0) / len(sample)
+    variance *= max(0.0, 1 - len(sample) / population)
+    return entropy, np.sqrt(variance)
+
+
+def _find_best_guess_sampled(candidates: CandidateSet, pool: np.ndarray, deadline=None) -> Tuple[str, bool]:
+    """Race the pool on growing samples, dropping guesses whose interval falls below the leader's.
+
+    Exact scores settle whatever is still in the race at SAMPLE_MAX.
+    """
+    order = sample_order(candidates)
+    alive = pool
+    bonus = IN_LIST_BONUS * candidates.mask()
+    size = SAMPLE_START
+    while True:
+        entropy, error = sampled_entropies(alive, order[:size], len(order))
+        scores = entropy + bonus[alive]
+        leader = int(np.argmax(scores))
+        upper = scores + SAMPLE_Z * error
+        upper[leader] = np.inf
+        leader_word = get_word_list()[alive[leader]]
+        alive = alive[upper >= scores[leader] - SAMPLE_Z * error[leader]]
+        if len(alive) == 1:
+            return leader_word, True
+        if expired(deadline):
+            return leader_word, False
+        if size >= SAMPLE_MAX or size >= len(order):
+            break
+        size *= 2
+
+    exact = score_guesses(alive, candidates)
+    return get_word_list()[alive[int(np.argmax(exact))]], True
+
+
+def _find_best_guess_legacy(candidates: CandidateSet, deadline=None) -> Tuple[str, bool]:
     guess_pool = candidates[:20]
     starters = ['slate', 'crane', 'trace', 'roate', 'raise']
     for s in starters:
-        if s not in guess_pool and s in WORD_LIST:
+        if s not in guess_pool and s in get_lexicon():
             guess_pool.append(s)
             
     best_guess = guess_pool[0]
     best_score = -float('inf')
     
-    for guess in guess_pool:
+    for i, guess in enumerate(guess_pool):
+        if i > 0 and expired(deadline):
+            return best_guess, False
+
         # Calculate entropy
         entropy = calculate_entropy(guess, candidates)
         
         # Heuristic Bonus
-        in_list_bonus = 0.5 if guess in candidates else 0
+        in_list_bonus = IN_LIST_BONUS if guess in candidates else 0
         
         score = entropy + in_list_bonus
         if score > best_score:
             best_score = score
             best_guess = guess
             
-    return best_guess
+    return best_guess, True
+
+
+def policy_name(guess_pool: str = None, top_k: int = None, heuristic: str = None) -> str:
+    guess_pool = guess_pool or GUESS_POOL
+    heuristic = heuristic or HEURISTIC
+    size = str(top_k or TOP_K) if guess_pool == "topk" else ""
+    if guess_pool == "legacy":
+        return f"astar-legacy-v{HEURISTIC_VERSION}"
+    estimator = f"-sampled{SAMPLE_SEED}" if ENTROPY_ESTIMATOR == "sampled" and heuristic == "entropy" else ""
+    heuristic = f"-{heuristic}" if heuristic != "entropy" else ""
+    return f"astar-{guess_pool}{size}{heuristic}{estimator}-v{HEURISTIC_VERSION}"
+
+
+def _find_best_guess_ranked(candidates: CandidateSet, pool: np.ndarray, prefilter: np.ndarray,
+                            deadline) -> Tuple[str, bool]:
+    """Score the pool in SCORE_CHUNK steps, most promising (by prefilter) first, until the deadline.
+
+    The first step always runs. Ties go to the earliest word in WORD_LIST, as in the one-pass scoring.
+    """
+    ranked = pool[np.argsort(-prefilter[pool], kind="stable")]
+    best_index, best_score = -1, -float("inf")
+    for start in range(0, len(ranked), SCORE_CHUNK):
+        if start > 0 and expired(deadline):
+            return get_word_list()[best_index], False
+        chunk = ranked[start:start + SCORE_CHUNK]
+        scores = score_guesses(chunk, candidates)
+        i = int(np.argmax(scores))
+        ties = chunk[scores == scores[i]]
+        if scores[i] > best_score or (scores[i] == best_score and ties.min() < best_index):
+            best_index, best_score = int(ties.min()), scores[i]
+    return get_word_list()[best_index], True
+
+
+def _find_best_guess(candidates: CandidateSet, guess_pool: str, top_k: int, deadline=None) -> Tuple[str, bool]:
+    if guess_pool == "legacy":
+        return _find_best_guess_legacy(candidates, deadline)
+
+    # The sampling confidence intervals are for entropy only
+    if ENTROPY_ESTIMATOR == "sampled" and HEURISTIC == "entropy" and len(candidates) >= SAMPLE_EXACT_BELOW:
+        return _find_best_guess_sampled(candidates, guess_pool_indices(candidates, guess_pool, top_k), deadline)
+
+    if deadline is not None:
+        prefilter = _prefilter_scores(candidates)
+        pool = guess_pool_indices(candidates, guess_pool, top_k, prefilter)
+        return _find_best_guess_ranked(candidates, pool, prefilter, deadline)
+
+    pool = guess_pool_indices(candidates, guess_pool, top_k)
+    scores = score_guesses(pool, candidates)
+    # argmax keeps the first maximum, i.e. the earliest word in WORD_LIST
+    return get_word_list()[pool[int(np.argmax(scores))]], True
+
+
+def choose_guess_astar(candidates: CandidateSet, guess_pool: str = None, top_k: int = None,
+                       deadline=None) -> Tuple[str, bool]:
+    """(guess, completed): completed is False if the deadline stopped scoring early."""
+    if len(candidates) <= 2:
+        return candidates[0], True
+
+    guess_pool = guess_pool or GUESS_POOL
+    top_k = top_k or TOP_K
+    key = f"{policy_name(guess_pool, top_k)}:{candidates.fingerprint()}"
+    guess = _BEST_GUESS_CACHE.get(key)
+    if guess is not None:
+        return guess, True
+    guess, completed = _find_best_guess(candidates, guess_pool, top_k, deadline)
+    if completed:
+        # Hurried guesses are not the policy's decision, so they are never cached
+        _BEST_GUESS_CACHE.put(key, guess)
+    return guess, completed
+
+
+def find_best_guess_astar(candidates: CandidateSet, guess_pool: str = None, top_k: int = None) -> str:
+    return choose_guess_astar(candidates, guess_pool, top_k)[0]
+
+
+def top_guesses(candidates: CandidateSet, n: int = 5, guess_pool: str = None,
+                top_k: int = None, heuristic: str = None) -> List[Tuple[str, float]]:
+    """The n best guesses with their scores under `heuristic` (default HEURISTIC), best first (the first
+    is find_best_guess_astar's pick unless the guess pool is "legacy", which ranks like "topk" here)."""
+    if not candidates:
+        return []
+
+    guess_pool = guess_pool or GUESS_POOL
+    if guess_pool == "legacy":
+        guess_pool = "topk"
+    key = f"{policy_name(guess_pool, top_k, heuristic)}:{n}:{candidates.fingerprint()}"
+    ranked = _HINT_CACHE.get(key)
+    if ranked is None:
+        pool = guess_pool_indices(candidates, guess_pool, top_k or TOP_K)
+        scores = score_guesses(pool, candidates, heuristic)
+        # Best score first, ties to the earliest word in WORD_LIST
+        order = np.lexsort((pool, -scores))[:n]
+        ranked = [(get_word_list()[pool[i]], float(scores[i])) for i in order]
+        _HINT_CACHE.put(key, ranked)
+    return ranked
+
+
+def best_guess_cache_stats() -> Dict:
+    return _BEST_GUESS_CACHE.stats()
+
+
+def clear_best_guess_cache() -> None:
+    _BEST_GUESS_CACHE.clear()
+
+
+def save_best_guess_cache(path=BEST_GUESS_CACHE_PATH) -> None:
+    """Write the cached decisions (least recently used first) so a later process starts warm."""
+    payload = {"dictionary": dictionary_hash(), "entries": _BEST_GUESS_CACHE.items()}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def load_best_guess_cache(path=BEST_GUESS_CACHE_PATH) -> int:
+    """Merge a saved cache into memory; returns the number of entries loaded."""
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return 0
+    if payload.get("dictionary") != dictionary_hash():
+        return 0
+    for key, guess in payload["entries"]:
+        _BEST_GUESS_CACHE.put(key, guess)
+    return len(payload["entries"])
 
 #LOGIC FOR TESTING PURPOSES
-def solve(target: str):
+def iter_solve(target: str, guess_pool: str = None, top_k: int = None, time_budget: float = None, cancel=None):
 
-    candidates = WORD_LIST.copy()
-    history = []
+    deadline = make_deadline(time_budget)
+    candidates = CandidateSet.full()
+    history = SolveHistory()
     
     for _ in range(6):
-        if not candidates:
+        if not candidates or is_cancelled(cancel):
             break
             
-        guess = find_best_guess_astar(candidates)
+        turn_start = time.perf_counter()
+        guess, completed = choose_guess_astar(candidates, guess_pool, top_k, deadline)
         
         pattern = get_pattern(guess, target)
-        history.append((guess, pattern))
+        history.record(guess, pattern, completed)
         
-        if pattern == (2, 2, 2, 2, 2):
+        if pattern == ALL_GREEN:
+            STATS.record_turn(turn_start)
+            yield guess, pattern
             return history
             
         candidates = filter_words(candidates, guess, pattern)
+        STATS.record_turn(turn_start)
+        yield guess, pattern
         
-    return history
\ No newline at end of file
+    return history
+
+
+def solve(target: str, guess_pool: str = None, top_k: int = None, time_budget: float = None):
+    return run_steps(iter_solve(target, guess_pool, top_k, time_budget))
+
+
+def solve_many(targets: List[str], guess_pool: str = None, top_k: int = None):
+    """Same histories as [solve(t) for t in targets], deciding each shared game state once."""
+    histories = [None] * len(targets)
+
+    def walk(candidates: CandidateSet, history: list, group: List[int]):
+        if len(history) == 6 or not candidates:
+            for t in group:
+                histories[t] = list(history)
+            return
+
+        guess = find_best_guess_astar(candidates, guess_pool, top_k)
+        for pattern, members in split_by_feedback(guess, targets, group).items():
+            step = history + [(guess, pattern)]
+            if pattern == ALL_GREEN:
+                for t in members:
+                    histories[t] = list(step)
+            else:
+                walk(filter_words(candidates, guess, pattern), step, members)
+
+    walk(CandidateSet.full(), [], list(range(len(targets))))
+    return histories
@@ -1,15 +1,19 @@
 import sys
+import time
 from pathlib import Path
+from typing import List
 from collections import deque
 
 #IMPORT
 sys.path.append(str(Path(__file__).parent.parent))
 
-from game_logic import WORD_LIST, get_pattern, filter_words
+from game_logic import ALL_GREEN, STATS, CandidateSet, SolveHistory, run_steps, is_cancelled, get_pattern, \
+                       filter_words, split_by_feedback
 
-def solve(target: str):
-    candidates = WORD_LIST.copy()
-    history = []
+def iter_solve(target: str, time_budget: float = None, cancel=None):
+    # Every guess is the queue front, so no turn ever needs cutting short
+    candidates = CandidateSet.full()
+    history = SolveHistory()
 
     first_guess = "crane"
     if first_guess not in candidates:
@@ -19,8 +23,9 @@ def solve(target: str):
     attempts = 0
     max_attempts = 20
     
-    while attempts < max_attempts:
+    while attempts < max_attempts and not is_cancelled(cancel):
         attempts += 1
+        turn_start = time.perf_counter()
         
         if not queue:
             if not candidates:
@@ -29,12 +34,55 @@ def solve(target: str):
             
         guess = queue.popleft()
         pattern = get_pattern(guess, target)
-        history.append((guess, pattern))
-        if pattern == (2, 2, 2, 2, 2):
+        history.record(guess, pattern)
+        if pattern == ALL_GREEN:
+            STATS.record_turn(turn_start)
+            yield guess, pattern
             return history
             
         candidates = filter_words(candidates, guess, pattern)
         
         queue = deque(candidates)
+        STATS.record_turn(turn_start)
+        yield guess, pattern
         
-    return history
\ No newline at end of file
+    return history
+
+
+def solve(target: str, time_budget: float = None):
+    return run_steps(iter_solve(target, time_budget))
+
+
+def solve_many(targets: List[str]):
+    """Same histories as [solve(t) for t in targets], deciding each shared game state once."""
+    histories = [None] * len(targets)
+    max_attempts = 20
+
+    def walk(candidates: CandidateSet, history: list, group: List[int]):
+        if len(history) == max_attempts:
+            for t in group:
+                histories[t] = list(history)
+            return
+
+        if not history:
+            guess = "crane"
+            if guess not in candidates:
+                guess = candidates[0]
+        elif not candidates:
+            for t in group:
+                histories[t] = list(history)
+            return
+        else:
+            # The queue is rebuilt from the candidates every turn, so the next guess is its front
+            guess = candidates[0]
+
+        for pattern, members in split_by_feedback(guess, targets, group).items():
+            step = history + [(guess, pattern)]
+            if pattern == ALL_GREEN:
+                for t in members:
+                    histories[t] = list(step)
+            else:
+                walk(filter_words(candidates, guess, pattern), step, members)
+
+    walk(CandidateSet.full(), [], list(range(len(targets))))
+    return histories
@@ -0,0 +1,60 @@
+import sys
+from pathlib import Path
+from typing import Callable, Dict
+
+import numpy as np
+
+# Import from game_logic
+sys.path.append(str(Path(__file__).parent.parent))
+from game_logic import ALL_GREEN
+
+# Every scorer maps per-guess pattern histograms, shape (guesses, 243), to one
+# score per guess; higher is better. histograms[:, ALL_GREEN] is 1 exactly when
+# the guess is itself a candidate.
+HEURISTICS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {}
+
+IN_LIST_BONUS = 0.5
+
+
+def register(name: str):
+    def decorator(func: Callable[[np.ndarray], np.ndarray]):
+        HEURISTICS[name] = func
+        return func
+    return decorator
+
+
+def entropies_from_histograms(histograms: np.ndarray, total) -> np.ndarray:
+    p = histograms / total
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terms = np.where(histograms > 0, p * np.log2(p), 0.0)
+    return -terms.sum(axis=1)
+
+
+@register("entropy")
+def entropy(histograms: np.ndarray) -> np.ndarray:
+    """Expected information in bits, plus IN_LIST_BONUS for guesses that could win now."""
+    total = histograms.sum(axis=1, keepdims=True)
+    return entropies_from_histograms(histograms, total) + IN_LIST_BONUS * (histograms[:, ALL_GREEN] > 0)
+
+
+@register("minimax")
+def minimax(histograms: np.ndarray) -> np.ndarray:
+    """Minus the largest bucket left after the guess (a win leaves nothing)."""
+    remaining = histograms.copy()
+    remaining[:, ALL_GREEN] = 0
+    return -remaining.max(axis=1).astype(np.float64)
+
+
+@register("expected_size")
+def expected_size(histograms: np.ndarray) -> np.ndarray:
+    """Minus the expected number of candidates left after the guess."""
+    total = histograms.sum(axis=1)
+    squares = (histograms.astype(np.float64) ** 2).sum(axis=1) - histograms[:, ALL_GREEN]
+    return -squares / total
+
+
+@register("distinct_patterns")
+def distinct_patterns(histograms: np.ndarray) -> np.ndarray:
+    """Number of different feedbacks the guess can produce."""
+    return np.count_nonzero(histograms, axis=1).astype(np.float64)
+
@@ -0,0 +1,280 @@
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Import from game_logic
+sys.path.append(str(Path(__file__).parent.parent))
+from game_logic import ALL_GREEN, STATS, CandidateSet, LRUCache, SolveHistory, run_steps, is_cancelled, get_pattern, \
+                       filter_words, get_pattern_matrix, get_word_list, make_deadline, time_left
+from solvers import astar_solver
+
+# "expected": minimise total (= average) guesses over the candidates
+# "worst":    minimise the number of guesses for the unluckiest candidate
+OBJECTIVES = ("expected", "worst")
+MAX_TURNS = 6
+# Per-turn search budgets
+DEFAULT_NODE_BUDGET = 20_000
+DEFAULT_TIME_BUDGET = 1.0
+# Guesses tried per node: the best MAX_GUESSES by entropy among the
+# candidates and the A* top-k pool
+MAX_GUESSES = 30
+# solve() only searches once the set is this small; bigger sets use A*
+ONLINE_MAX_CANDIDATES = 100
+TABLE_SIZE = 500_000
+
+INF = float("inf")
+
+
+class BudgetExceeded(Exception):
+    pass
+
+
+class OptimalSearch:
+    """Depth-first branch-and-bound over guess policies with a transposition table.
+
+    Each node only tries its best `max_guesses` guesses by entropy, so "exact"
+    means optimal over those guesses, not over the whole dictionary.
+    search() returns that optimum when it is below `beta`, otherwise a lower
+    bound that is >= beta. The table keeps both kinds of result, keyed by
+    (candidate set fingerprint, turns left) so entries do not hold on to the sets.
+    """
+
+    def __init__(self, objective: str = "expected", max_guesses: int = MAX_GUESSES, dictionary_guesses: bool = True):
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unknown objective: {objective}")
+        self.objective = objective
+        self.max_guesses = max_guesses
+        self.dictionary_guesses = dictionary_guesses
+        self.table = LRUCache(TABLE_SIZE)
+        self.nodes = 0
+        self._node_limit = INF
+        self._deadline = INF
+
+    #BOUNDS
+
+    def lower_bound(self, n: int, turns_left: int) -> float:
+        """Admissible bound for a set of n candidates: only one can be hit by the next guess."""
+        if n == 0:
+            return 0
+        if turns_left <= 0 or (n > 1 and turns_left == 1):
+            return INF
+        if n == 1:
+            return 1
+        return 2 * n - 1 if self.objective == "expected" else 2
+
+    def _guess_bound(self, sizes: np.ndarray, turns_left: int) -> float:
+        """Bound for a guess from its feedback bucket sizes (indexed by pattern)."""
+        left = np.delete(sizes, ALL_GREEN)
+        left = left[left > 0]
+        if left.size == 0:
+            return 1 if self.objective == "worst" else int(sizes.sum())
+        if turns_left <= 1 or (turns_left == 2 and left.max() > 1):
+            return INF
+        # Same as summing lower_bound() over the buckets
+        if self.objective == "expected":
+            return int(sizes.sum()) + 2 * int(left.sum()) - left.size
+        return 3 if left.max() > 1 else 2
+
+    #SEARCH
+
+    def _guess_options(self, candidates: CandidateSet, turns_left: int) -> List[tuple]:
+        """(bound, rank, guess, groups) for the guesses worth trying, most promising first."""
+        pool = candidates.indices
+        if self.dictionary_guesses:
+            topk = astar_solver.guess_pool_indices(candidates, "topk", astar_solver.TOP_K)
+            pool = np.union1d(pool, topk)
+        if len(pool) > self.max_guesses:
+            # Always entropy, whatever A* uses, so table entries never mix rankings
+            scores = astar_solver.score_guesses(pool, candidates, heuristic="entropy")
+            pool = pool[np.argsort(-scores, kind="stable")[:self.max_guesses]]
+
+        matrix = get_pattern_matrix()
+        members = candidates.indices
+        options = []
+        for rank, gi in enumerate(pool.tolist()):
+            codes = matrix[gi][members]
+            sizes = np.bincount(codes, minlength=ALL_GREEN + 1)
+            if sizes.max() == len(members) and sizes[ALL_GREEN] == 0:
+                # Leaves every candidate together: never useful
+                continue
+            options.append((self._guess_bound(sizes, turns_left), rank, gi, codes))
+        options.sort(key=lambda option: (option[0], option[1]))
+        return options
+
+    @staticmethod
+    def _partition(members: np.ndarray, codes: np.ndarray) -> List[Tuple[int, CandidateSet]]:
+        """Feedback buckets of a guess, biggest first: they decide the cutoffs soonest."""
+        order = np.argsort(codes, kind="stable")
+        patterns, starts, counts = np.unique(codes[order], return_index=True, return_counts=True)
+        groups = [(int(p), CandidateSet.from_indices(members[order[start:start + count]]))
+                  for p, start, count in zip(patterns, starts, counts)]
+        groups.sort(key=lambda item: -len(item[1]))
+        return groups
+
+    def _evaluate(self, candidates: CandidateSet, codes: np.ndarray, turns_left: int, limit: float) -> float:
+        """Cost of a guess giving `codes`; any value >= limit means 'no better than limit'."""
+        n = len(candidates)
+        groups = self._partition(candidates.indices, codes)
+        rest = [self.lower_bound(len(group), turns_left - 1) if pattern != ALL_GREEN else 0
+                for pattern, group in groups]
+        if self.objective == "expected":
+            total = n + sum(rest)
+            for i, (pattern, group) in enumerate(groups):
+                if pattern == ALL_GREEN:
+                    continue
+                total -= rest[i]
+                value = self.search(group, turns_left - 1, limit - total)
+                total += value
+                if total >= limit:
+                    return total
+            return total
+
+        worst = 1
+        for pattern, group in groups:
+            if pattern == ALL_GREEN:
+                continue
+            worst = max(worst, 1 + self.search(group, turns_left - 1, limit - 1))
+            if worst >= limit:
+                return worst
+        return worst
+
+    def search(self, candidates: CandidateSet, turns_left: int, beta: float = INF) -> float:
+        n = len(candidates)
+        bound = self.lower_bound(n, turns_left)
+        if n <= 1 or bound >= beta or bound == INF:
+            return bound
+
+        key = (candidates.fingerprint(), turns_left)
+        entry = self.table.get(key)
+        if entry is not None:
+            value, exact = entry
+            if exact or value >= beta:
+                return value
+
+        self.nodes += 1
+        if self.nodes > self._node_limit or time.perf_counter() > self._deadline:
+            raise BudgetExceeded()
+
+        best = INF
+        for guess_bound, _, _, codes in self._guess_options(candidates, turns_left):
+            limit = min(beta, best)
+            if guess_bound >= limit:
+                break
+            value = self._evaluate(candidates, codes, turns_left, limit)
+            if value < best:
+                best = value
+
+        if best < beta:
+            self.table.put(key, (best, True))
+            return best
+        self.table.put(key, (beta, False))
+        return beta
+
+    def best_guess(self, candidates: CandidateSet, turns_left: int = MAX_TURNS,
+                   node_budget: int = DEFAULT_NODE_BUDGET, time_budget: float = DEFAULT_TIME_BUDGET):
+        """(guess, value, exact). exact means optimal among the top `max_guesses` guesses per node.
+        Out of budget, returns the best guess proven so far (exact=False)."""
+        if len(candidates) == 1:
+            return candidates[0], 1, True
+
+        self.nodes = 0
+        self._node_limit = node_budget if node_budget is not None else INF
+        self._deadline = time.perf_counter() + time_budget if time_budget is not None else INF
+
+        options = self._guess_options(candidates, turns_left)
+        best_guess, best = options[0][2], INF
+        exact = True
+        try:
+            for guess_bound, _, gi, codes in options:
+                if guess_bound >= best:
+                    break
+                value = self._evaluate(candidates, codes, turns_left, best)
+                if value < best:
+                    best_guess, best = gi, value
+        except BudgetExceeded:
+            exact = False
+        finally:
+            self._node_limit = INF
+            self._deadline = INF
+
+        if STATS.enabled:
+            STATS.nodes_expanded += self.nodes
+        return get_word_list()[best_guess], best, exact
+
+
+_SEARCHES: Dict[str, OptimalSearch] = {}
+
+
+def get_search(objective: str = "expected") -> OptimalSearch:
+    """Shared search per objective, so its table carries over between solves."""
+    if objective not in _SEARCHES:
+        _SEARCHES[objective] = OptimalSearch(objective)
+    return _SEARCHES[objective]
+
+
+def clear_searches() -> None:
+    """Drop the shared searches and their tables, so the next solve starts cold."""
+    _SEARCHES.clear()
+
+
+def choose_guess_optimal(candidates: CandidateSet, turns_left: int = MAX_TURNS, objective: str = "expected",
+                         node_budget: int = DEFAULT_NODE_BUDGET, turn_budget: float = DEFAULT_TIME_BUDGET,
+                         deadline=None) -> Tuple[str, bool]:
+    """(guess, completed): completed is False if a budget or the deadline stopped the search.
+
+    A completed search is optimal over the top MAX_GUESSES guesses per node only.
+    """
+    if len(candidates) > ONLINE_MAX_CANDIDATES:
+        return astar_solver.choose_guess_astar(candidates, deadline=deadline)
+    if deadline is not None:
+        remaining = max(time_left(deadline), 0)
+        turn_budget = remaining if turn_budget is None else min(turn_budget, remaining)
+    guess, value, exact = get_search(objective).best_guess(candidates, turns_left, node_budget, turn_budget)
+    if value == INF:
+        # No policy is proven to finish in time: fall back to the entropy pick
+        guess, completed = astar_solver.choose_guess_astar(candidates, deadline=deadline)
+        return guess, completed and exact
+    return guess, exact
+
+
+def find_best_guess_optimal(candidates: CandidateSet, turns_left: int = MAX_TURNS, objective: str = "expected",
+                            node_budget: int = DEFAULT_NODE_BUDGET, turn_budget: float = DEFAULT_TIME_BUDGET) -> str:
+    return choose_guess_optimal(candidates, turns_left, objective, node_budget, turn_budget)[0]
+
+
+def iter_solve(target: str, objective: str = "expected", node_budget: int = DEFAULT_NODE_BUDGET,
+               turn_budget: float = DEFAULT_TIME_BUDGET, time_budget: float = None, cancel=None):
+
+    deadline = make_deadline(time_budget)
+    candidates = CandidateSet.full()
+    history = SolveHistory()
+
+    for turn in range(MAX_TURNS):
+        if not candidates or is_cancelled(cancel):
+            break
+
+        turn_start = time.perf_counter()
+        guess, completed = choose_guess_optimal(candidates, MAX_TURNS - turn, objective, node_budget, turn_budget,
+                                                deadline)
+
+        pattern = get_pattern(guess, target)
+        history.record(guess, pattern, completed)
+
+        if pattern == ALL_GREEN:
+            STATS.record_turn(turn_start)
+            yield guess, pattern
+            return history
+
+        candidates = filter_words(candidates, guess, pattern)
+        STATS.record_turn(turn_start)
+        yield guess, pattern
+
+    return history
+
+
+def solve(target: str, objective: str = "expected", node_budget: int = DEFAULT_NODE_BUDGET,
+          turn_budget: float = DEFAULT_TIME_BUDGET, time_budget: float = None):
+    return run_steps(iter_solve(target, objective, node_budget, turn_budget, time_budget))
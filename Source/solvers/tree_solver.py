@@ -0,0 +1,164 @@
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+
+# Import from game_logic
+sys.path.append(str(Path(__file__).parent.parent))
+from game_logic import ALL_GREEN, STATS, CACHE_DIR, CandidateSet, SolveHistory, run_steps, is_cancelled, get_pattern, \
+                       get_pattern_matrix, get_word_list, get_word_index, dictionary_hash
+from solvers import astar_solver
+
+# Bump when the on-disk layout or the compile walk changes
+TREE_VERSION = 1
+MAX_TURNS = 6
+
+
+class DecisionTree:
+    """A deterministic guess policy compiled over every answer in WORD_LIST.
+
+    Node i guesses WORD_LIST[guesses[i]]; edge k leads from edge_parent[k] to
+    edge_child[k] on feedback edge_pattern[k]. depths[t] is the number of
+    guesses the policy needs for answer t (0 if it fails within MAX_TURNS).
+    """
+
+    def __init__(self, guesses: np.ndarray, edge_parent: np.ndarray, edge_pattern: np.ndarray,
+                 edge_child: np.ndarray, depths: np.ndarray, policy: str):
+        self.guesses = guesses
+        self.edge_parent = edge_parent
+        self.edge_pattern = edge_pattern
+        self.edge_child = edge_child
+        self.depths = depths
+        self.policy = policy
+        self._children = {(int(p), int(pat)): int(c) for p, pat, c in zip(edge_parent, edge_pattern, edge_child)}
+
+    def guess(self, node: int) -> str:
+        return get_word_list()[self.guesses[node]]
+
+    def next_node(self, node: int, pattern: int):
+        return self._children.get((node, pattern))
+
+    def stats(self) -> Dict:
+        solved = self.depths[self.depths > 0]
+        return {
+            "policy": self.policy,
+            "nodes": len(self.guesses),
+            "answers": len(self.depths),
+            "average_guesses": float(solved.mean()) if solved.size else 0.0,
+            "worst_case": int(solved.max()) if solved.size else 0,
+            "failures": [get_word_list()[i] for i in np.flatnonzero(self.depths == 0)],
+        }
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(path, guesses=self.guesses, edge_parent=self.edge_parent,
+                            edge_pattern=self.edge_pattern, edge_child=self.edge_child,
+                            depths=self.depths, policy=np.array(self.policy),
+                            version=np.array(TREE_VERSION), dictionary=np.array(dictionary_hash()))
+
+    @classmethod
+    def load(cls, path: Path):
+        """Load a saved tree, or None if it was built for another dictionary or version."""
+        with np.load(path) as data:
+            if int(data["version"]) != TREE_VERSION or str(data["dictionary"]) != dictionary_hash():
+                return None
+            return cls(data["guesses"], data["edge_parent"], data["edge_pattern"],
+                       data["edge_child"], data["depths"], str(data["policy"]))
+
+
+def compile_tree(policy: Callable[[CandidateSet], str], policy_name: str, max_turns: int = MAX_TURNS) -> DecisionTree:
+    """Walk `policy` over every possible answer, grouping answers by feedback."""
+    matrix = get_pattern_matrix()
+    guesses: List[int] = []
+    edges: List[tuple] = []
+    depths = np.zeros(len(get_word_list()), dtype=np.uint8)
+
+    def walk(candidates: CandidateSet, turn: int) -> int:
+        node = len(guesses)
+        gi = get_word_index()[policy(candidates)]
+        guesses.append(gi)
+
+        members = candidates.indices
+        codes = matrix[gi][members]
+        for pattern in np.unique(codes).tolist():
+            group = members[codes == pattern]
+            if pattern == ALL_GREEN:
+                depths[group] = turn
+            elif turn < max_turns:
+                child = walk(CandidateSet.from_indices(group), turn + 1)
+                edges.append((node, pattern, child))
+        return node
+
+    walk(CandidateSet.full(), 1)
+    edge_array = np.array(edges, dtype=np.int32).reshape(-1, 3)
+    return DecisionTree(np.array(guesses, dtype=np.int32), edge_array[:, 0], edge_array[:, 1].astype(np.uint8),
+                        edge_array[:, 2], depths, policy_name)
+
+
+def tree_path(policy_name: str) -> Path:
+    return CACHE_DIR / f"tree_{policy_name}_{dictionary_hash()[:16]}_v{TREE_VERSION}.npz"
+
+
+_TREE = None
+
+
+def get_tree() -> DecisionTree:
+    """Decision tree for the current A* policy, compiled and saved on first use."""
+    global _TREE
+    policy_name = astar_solver.policy_name()
+    if _TREE is None or _TREE.policy != policy_name:
+        path = tree_path(policy_name)
+        tree = DecisionTree.load(path) if path.exists() else None
+        if tree is None:
+            print(f"Compiling decision tree for {policy_name} (one-time)...")
+            tree = compile_tree(astar_solver.find_best_guess_astar, policy_name)
+            tree.save(path)
+        _TREE = tree
+    return _TREE
+
+
+def iter_solve(target: str, time_budget: float = None, cancel=None):
+    if target not in get_word_index():
+        # The tree only covers dictionary answers
+        return (yield from astar_solver.iter_solve(target, time_budget=time_budget, cancel=cancel))
+
+    # Each turn is a lookup, so only the one-time compile in get_tree() can be slow
+    tree = get_tree()
+    node = 0
+    history = SolveHistory()
+
+    for _ in range(MAX_TURNS):
+        if is_cancelled(cancel):
+            break
+        turn_start = time.perf_counter()
+        guess = tree.guess(node)
+        pattern = get_pattern(guess, target)
+        history.record(guess, pattern)
+
+        if pattern == ALL_GREEN:
+            STATS.record_turn(turn_start)
+            yield guess, pattern
+            return history
+
+        node = tree.next_node(node, pattern)
+        STATS.record_turn(turn_start)
+        yield guess, pattern
+        if node is None:
+            break
+
+    return history
+
+
+def solve(target: str, time_budget: float = None):
+    return run_steps(iter_solve(target, time_budget))
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    stats = get_tree().stats()
+    print(f"Policy: {stats['policy']} | Nodes: {stats['nodes']} | Answers: {stats['answers']}")
+    print(f"Average guesses: {stats['average_guesses']:.4f} | Worst case: {stats['worst_case']}")
+    print(f"Failures ({len(stats['failures'])}): {', '.join(stats['failures'])}")
+    print(f"Done in {time.perf_counter() - start:.1f}s")
@@ -1,29 +1,50 @@
 import sys
 import heapq
-import time
+import itertools
 import random
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Tuple
 
 # Import from game_logic
 sys.path.append(str(Path(__file__).parent.parent))
-from game_logic import WORD_LIST, get_pattern, filter_words
+from game_logic import ALL_GREEN, STATS, CandidateSet, SolveHistory, get_pattern, filter_words, make_deadline, \
+                       expired, is_cancelled
 
 class UCSNode:
-    def __init__(self, candidates: List[str], guess_history: List, path_cost: float):
+    """Search node: shares its candidate set and links to its parent instead of copying history."""
+
+    __slots__ = ("candidates", "parent", "move", "path_cost")
+
+    def __init__(self, candidates: CandidateSet, parent: "UCSNode" = None, move: Tuple[str, int] = None,
+                 path_cost: float = 0.0):
         self.candidates = candidates
-        self.guess_history = guess_history
+        self.parent = parent
+        self.move = move
         self.path_cost = path_cost
 
-    def __lt__(self, other):
-        return self.path_cost < other.path_cost
+    def guess_history(self) -> List[Tuple[str, int]]:
+        history = []
+        node = self
+        while node.move is not None:
+            history.append(node.move)
+            node = node.parent
+        history.reverse()
+        return history
+
+    def has_guessed(self, guess: str) -> bool:
+        node = self
+        while node.move is not None:
+            if node.move[0] == guess:
+                return True
+            node = node.parent
+        return False
 
-def find_guesses_pool(candidates: List[str]) -> List[str]:
+def find_guesses_pool(candidates: CandidateSet) -> List[str]:
     if len(candidates) <= 20:
         return list(candidates)
     
     # SELECT POOL OF 15 CANDIDATES + STRONG STARTERS
-    pool = list(candidates[:15])
+    pool = candidates[:15]
 
     starters = ['slate', 'crane', 'trace', 'roate', 'raise']
     for s in starters:
@@ -32,45 +53,80 @@ def find_guesses_pool(candidates: List[str]) -> List[str]:
             
     return pool
 
-def solve(target: str):
+def finish_from(node: UCSNode, target: str) -> SolveHistory:
+    """Anytime answer once the search is out of time: the path to `node`, then play its candidates in order.
 
-    start_time = time.time()
+    Every turn is marked cut short, since none of them comes from a finished search.
+    """
+    history = SolveHistory(node.guess_history(), completed=False)
+    candidates = node.candidates
+    while len(history) < 6 and candidates:
+        guess = candidates[0]
+        pattern = get_pattern(guess, target)
+        history.record(guess, pattern, completed=False)
+        if pattern == ALL_GREEN:
+            break
+        candidates = filter_words(candidates, guess, pattern)
+    return history
 
-    root = UCSNode(candidates=WORD_LIST.copy(), guess_history=[], path_cost=0.0)
+def search(target: str, time_budget: float = None, cancel=None) -> SolveHistory:
 
+    deadline = make_deadline(time_budget)
+
+    root = UCSNode(CandidateSet.full())
+
+    # Heap entries are (path_cost, push order, node): ties pop in push order
     frontier = []
-    heapq.heappush(frontier, root)
+    counter = itertools.count()
+    heapq.heappush(frontier, (root.path_cost, next(counter), root))
+    if STATS.enabled:
+        STATS.nodes_pushed += 1
     
     expanded_nodes = 0
+    # Expanded node with the fewest candidates left, the best place to finish from on timeout
+    best_node = root
     visited_states = set()
+    # Identical candidate sets share one object, whose hash is computed once
+    interned: Dict[CandidateSet, CandidateSet] = {root.candidates: root.candidates}
 
     while frontier:
         # Get node with lowest path cost
-        node = heapq.heappop(frontier)
+        _, _, node = heapq.heappop(frontier)
     
         if node.path_cost >= 6:
             continue
 
-        state_key = tuple(sorted(node.candidates))
-        if state_key in visited_states:
+        if node.candidates in visited_states:
+            if STATS.enabled:
+                STATS.nodes_deduplicated += 1
             continue
-        visited_states.add(state_key)
+        visited_states.add(node.candidates)
+
+        if expired(deadline):
+            return finish_from(best_node, target)
+        if is_cancelled(cancel):
+            return SolveHistory()
+        if len(node.candidates) < len(best_node.candidates):
+            best_node = node
         
         expanded_nodes += 1
+        if STATS.enabled:
+            STATS.nodes_expanded += 1
         
         #GOAL TEST
         if len(node.candidates) == 1 and node.candidates[0] == target:
-            final_guess = node.candidates[0]
-            return node.guess_history + [(final_guess, (2, 2, 2, 2, 2))]
+            history = SolveHistory(node.guess_history())
+            history.record(node.candidates[0], ALL_GREEN)
+            return history
         
-        if node.guess_history and node.guess_history[-1][0] == target:
-            return node.guess_history
+        if node.move is not None and node.move[0] == target:
+            return SolveHistory(node.guess_history())
 
         #EXPAND NODE
         pool = find_guesses_pool(node.candidates)
         
         for guess in pool:
-            if any(guess == g for g, _ in node.guess_history):
+            if node.has_guessed(guess):
                 continue
                 
             # Get real pattern from Game (Environment)
@@ -82,10 +138,21 @@ def solve(target: str):
             if not new_candidates:
                 continue
 
-            new_history = node.guess_history + [(guess, real_pattern)]
-            new_cost = node.path_cost + 1
+            new_candidates = interned.setdefault(new_candidates, new_candidates)
+            child = UCSNode(new_candidates, node, (guess, real_pattern), node.path_cost + 1)
+            heapq.heappush(frontier, (child.path_cost, next(counter), child))
+            if STATS.enabled:
+                STATS.nodes_pushed += 1
             
-            child = UCSNode(new_candidates, new_history, new_cost)
-            heapq.heappush(frontier, child)
-            
-    return []
\ No newline at end of file
+    return SolveHistory()
+
+
+def iter_solve(target: str, time_budget: float = None, cancel=None):
+    # UCS plans the whole game before its first guess is known, so it checks `cancel` while searching
+    history = search(target, time_budget, cancel)
+    yield from history
+    return history
+
+
+def solve(target: str, time_budget: float = None):
+    return search(target, time_budget)
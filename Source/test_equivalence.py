@@ -0,0 +1,147 @@
+"""Equivalence checks for the fast paths: each must give exactly what the simple version gives.
+
+Run with `python -m pytest Source`.
+"""
+import math
+import random
+from functools import lru_cache
+
+import pytest
+
+from game_logic import ALL_GREEN, CandidateSet, Constraints, encode_pattern, filter_words, get_pattern, \
+                       get_word_list
+from solvers import astar_solver, bfs_solver, dfs_solver, tree_solver, optimal_solver
+
+SEED = 420
+
+
+def _repeated_letter_words():
+    return [word for word in get_word_list() if len(set(word)) < 5]
+
+
+def _random_history(rng: random.Random, turns: int):
+    """A real game history: random guesses (often with repeated letters) against a random target."""
+    words = get_word_list()
+    repeated = _repeated_letter_words()
+    target = rng.choice(repeated if rng.random() < 0.5 else words)
+    history = []
+    for _ in range(turns):
+        guess = rng.choice(repeated if rng.random() < 0.5 else words)
+        history.append((guess, get_pattern(guess, target)))
+    return history
+
+
+def _sample_targets(n: int):
+    """Random dictionary words plus an off-dictionary word and a duplicate."""
+    targets = random.Random(SEED).sample(get_word_list(), n)
+    return targets + ["zzzzz", targets[0]]
+
+
+def _chained_filter(history):
+    words = list(get_word_list())
+    for guess, pattern in history:
+        words = filter_words(words, guess, pattern)
+    return words
+
+
+#CONSTRAINTS
+
+@pytest.mark.parametrize("case", range(100))
+def test_constraints_match_chained_filter_words(case):
+    rng = random.Random(SEED + case)
+    history = _random_history(rng, rng.randint(1, 4))
+    expected = _chained_filter(history)
+
+    constraints = Constraints.from_history(history)
+    assert constraints.candidates.words() == expected
+    assert [word for word in get_word_list() if constraints.matches(word)] == expected
+
+
+@pytest.mark.parametrize("case", range(50))
+def test_constraints_incremental_add_matches_rebuild(case):
+    rng = random.Random(SEED + case)
+    history = _random_history(rng, 3)
+
+    constraints = Constraints()
+    for guess, pattern in history:
+        constraints.add(guess, pattern)
+        # Materialise after each guess, so later adds take the incremental path
+        constraints.candidates
+    assert constraints.candidates == Constraints.from_history(history).candidates
+
+
+@pytest.mark.parametrize("case", range(100))
+def test_single_pattern_matches_filter_words(case):
+    """Any pattern, including ones get_pattern never produces for repeated letters."""
+    rng = random.Random(SEED + case)
+    guess = rng.choice(_repeated_letter_words())
+    pattern = encode_pattern(tuple(rng.randrange(3) for _ in range(5)))
+
+    constraints = Constraints.from_history([(guess, pattern)])
+    assert constraints.candidates.words() == filter_words(list(get_word_list()), guess, pattern)
+
+
+#BATCH SOLVING
+
+@pytest.mark.parametrize("solver", [astar_solver, bfs_solver, dfs_solver], ids=["A*", "BFS", "DFS"])
+def test_solve_many_matches_solve(solver):
+    targets = _sample_targets(30)
+    # Cold caches for both, so solve_many cannot just replay solve's cached decisions
+    astar_solver.clear_best_guess_cache()
+    expected = [list(solver.solve(target)) for target in targets]
+    astar_solver.clear_best_guess_cache()
+    assert solver.solve_many(targets) == expected
+
+
+#DECISION TREE
+
+def test_tree_matches_astar():
+    """The compiled tree (built on first use) must replay A*'s decisions exactly."""
+    targets = _sample_targets(100)
+    astar_solver.clear_best_guess_cache()
+    expected = [list(astar_solver.solve(target)) for target in targets]
+    assert [list(tree_solver.solve(target)) for target in targets] == expected
+
+
+#OPTIMAL SEARCH
+
+def _exhaustive(words, objective: str, turns_left: int) -> float:
+    """Best cost over every policy guessing only candidates, by brute force."""
+
+    @lru_cache(maxsize=None)
+    def cost(group: tuple, turns: int) -> float:
+        if not group:
+            return 0
+        if turns == 0:
+            return math.inf
+        best = math.inf
+        for guess in group:
+            buckets = {}
+            for target in group:
+                buckets.setdefault(get_pattern(guess, target), []).append(target)
+            rest = [cost(tuple(bucket), turns - 1) for pattern, bucket in buckets.items() if pattern != ALL_GREEN]
+            if objective == "expected":
+                value = len(group) + sum(rest)
+            else:
+                value = max([1] + [1 + r for r in rest])
+            best = min(best, value)
+        return best
+
+    return cost(tuple(words), turns_left)
+
+
+def _cluster(affix: str, size: int):
+    """`size` words sharing a prefix or suffix: small, but with long chains of near-identical words."""
+    words = [word for word in get_word_list() if word.startswith(affix) or word.endswith(affix)]
+    return random.Random(SEED).sample(words, size)
+
+
+@pytest.mark.parametrize("objective", optimal_solver.OBJECTIVES)
+@pytest.mark.parametrize("affix, size", [("sha", 6), ("sha", 9), ("sha", 12), ("bra", 6), ("bra", 9),
+                                         ("bra", 12), ("ight", 6), ("ound", 6)])
+@pytest.mark.parametrize("turns_left", [4, 6])
+def test_optimal_search_matches_exhaustive(objective, affix, size, turns_left):
+    words = _cluster(affix, size)
+    # Candidate guesses only and no guess cap, so the search space is the brute force's
+    search = optimal_solver.OptimalSearch(objective, max_guesses=len(words), dictionary_guesses=False)
+    assert search.search(CandidateSet.from_words(words), turns_left) == _exhaustive(words, objective, turns_left)